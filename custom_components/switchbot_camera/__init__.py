@@ -8,8 +8,9 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.storage import Store
 
-from .coordinator import SwitchBotKVSCameraCoordinator
+from .coordinator import STORAGE_VERSION, SwitchBotKVSCameraCoordinator, storage_key
 
 _PLATFORMS: list[Platform] = [
     Platform.BUTTON,
@@ -63,6 +64,12 @@ async def async_remove_config_entry_device(
     return True
 
 
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Remove the stored device snapshot."""
+    store = Store(hass, STORAGE_VERSION, storage_key(config_entry.entry_id))
+    await store.async_remove()
+
+
 async def async_unload_entry(
     hass: HomeAssistant, config_entry: SwitchBotKVSCameraConfigEntry
 ) -> bool:
@@ -72,5 +79,5 @@ async def async_unload_entry(
     if unload_ok := await hass.config_entries.async_unload_platforms(
         config_entry, _PLATFORMS
     ):
-        config_entry.runtime_data.coordinator.unload()
+        await config_entry.runtime_data.coordinator.async_unload()
     return unload_ok
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
 from collections.abc import Callable
 import json
@@ -13,14 +14,17 @@ from aiohttp import ClientSession
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.serialization import pkcs12
 
+from ..debug_log import log_response  # noqa: TID252
 from .exceptions import ApiError
-from .model.devices import Device, DeviceDetail, Devices, Remote
+from .model.devices import Device, Devices, Remote
 from .model.group import Group
 from .model.kvs_credential import KvsCredential
 from .model.kvs_preset import KVSPreset
 
 LOGGER = logging.getLogger(__package__)
 
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+
 
 class SwitchBotApiClient:
     """SwitchBotClient class."""
@@ -33,6 +37,7 @@ class SwitchBotApiClient:
         http_client_session: ClientSession | None = None,
         api_credential: ApiCredential | None = None,
         save_refreshed_token: Callable[[], None] | None = None,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
     ) -> None:
         """Initialize."""
         self.device_id = device_id
@@ -42,6 +47,7 @@ class SwitchBotApiClient:
         self.http_client_session = http_client_session
         self.api_credential = api_credential
         self.save_refreshed_token = save_refreshed_token
+        self.max_concurrent_requests = max_concurrent_requests
 
     @property
     def _session(self) -> ClientSession:
@@ -104,7 +110,7 @@ class SwitchBotApiClient:
                 LOGGER.warning("URL:%s Response:%s", url, resp)
                 raise ApiError(f"Server error. status code {resp.get('statusCode')}")
 
-            LOGGER.debug("URL:%s Response:%s", url, resp)
+            log_response(LOGGER, url, resp)
             access_token = resp["body"]["access_token"]
             refresh_token = resp["body"]["refresh_token"]
             jwt_payload = json.loads(
@@ -131,7 +137,7 @@ class SwitchBotApiClient:
                 LOGGER.warning("URL:%s Response:%s", url, resp)
                 raise ApiError(f"Server error. status code {resp.get('statusCode')}")
 
-            LOGGER.debug("URL:%s Response:%s", url, resp)
+            log_response(LOGGER, url, resp)
             return resp["body"]
 
     async def __get_endpoints(
@@ -156,7 +162,7 @@ class SwitchBotApiClient:
                 LOGGER.warning("URL:%s Response:%s", url, resp)
                 raise ApiError(f"Server error. result code {resp.get('resultCode')}")
 
-            LOGGER.debug("URL:%s Response:%s", url, resp)
+            log_response(LOGGER, url, resp)
             return resp["data"]
 
     async def __get_policy_cert(
@@ -181,7 +187,7 @@ class SwitchBotApiClient:
                 LOGGER.warning("URL:%s Response:%s", url, resp)
                 raise ApiError(f"Server error. status code {resp.get('statusCode')}")
 
-            LOGGER.debug("URL:%s Response:%s", url, resp)
+            log_response(LOGGER, url, resp)
 
             pkcs12_key_and_certificates = pkcs12.load_pkcs12(
                 base64.b64decode(resp["body"]), b"12345678"
@@ -260,7 +266,7 @@ class SwitchBotApiClient:
                 LOGGER.warning("URL:%s Response:%s", url, resp)
                 raise ApiError(f"Server error. status code {resp.get('statusCode')}")
 
-            LOGGER.debug("URL:%s Response:%s", url, resp)
+            log_response(LOGGER, url, resp)
             self.api_credential.access_token = resp["body"]["access_token"]
             self.api_credential.jwt_payload = json.loads(
                 base64.b64decode(
@@ -287,7 +293,7 @@ class SwitchBotApiClient:
             if not resp.get("resultCode") or resp["resultCode"] != 100:
                 LOGGER.warning("URL:%s Response:%s", url, resp)
                 raise ApiError(f"Server error. result code {resp.get('resultCode')}")
-            LOGGER.debug("URL:%s Response:%s", url, resp)
+            log_response(LOGGER, url, resp)
             data = list[Group]()
             for groupDict in resp["data"]["groups"]:
                 group = Group()
@@ -295,46 +301,69 @@ class SwitchBotApiClient:
                 data.append(group)
             return data
 
-    async def get_all_devices(self) -> Devices:
-        """Get devices."""
+    async def get_all_devices(self) -> tuple[Devices, set[str]]:
+        """Get devices, and the IDs of the groups that could not be fetched.
+
+        The per-group requests are sent concurrently, bounded by
+        max_concurrent_requests. A group that fails is skipped with a warning so
+        the devices of the other groups are still returned; ApiError is raised
+        only when every group fails.
+        """
         await self.check_token_refresh()
         url = f"{self.api_credential.wonderlab_endpoint}/homepage/v1/device/getall"
         headers = {
             "Content-Type": "application/json",
             "authorization": self.api_credential.access_token,
         }
+        groups = await self.__get_all_groups()
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        async def get_group_devices(group: Group) -> Devices:
+            async with semaphore:
+                return await self.__get_group_devices(url, headers, group)
+
+        results = await asyncio.gather(
+            *(get_group_devices(group) for group in groups), return_exceptions=True
+        )
+
         devices: list[Device] = []
         remotes: list[Remote] = []
-        groups = await self.__get_all_groups()
-        for group in groups:
-            requestBody = {"groupID": group.groupID}
-            async with self._session.post(
-                url, headers=headers, data=json.dumps(requestBody)
-            ) as response:
-                if response.status != 200:
-                    LOGGER.warning("URL:%s Status:%s", url, response.status)
-                    raise ApiError(f"Server error. http status code {response.status}")
-
-                resp = await response.json()
-                if not resp.get("resultCode") or resp["resultCode"] != 100:
-                    LOGGER.warning("URL:%s Response:%s", url, resp)
-                    raise ApiError(
-                        f"Server error. result code {resp.get('resultCode')}"
-                    )
-                LOGGER.debug("URL:%s Response:%s", url, resp)
-                data = Devices([], [])
-                data.__dict__.update(resp["data"])
-                for deviceDict in data.devices:
-                    device = Device()
-                    device.__dict__.update(deviceDict)
-                    device.device_detail = DeviceDetail()
-                    device.device_detail.__dict__.update(deviceDict["device_detail"])
-                    devices.append(device)
-                for remoteDict in data.remotes:
-                    remote = Remote()
-                    remote.__dict__.update(remoteDict)
-                    remotes.append(remote)
-        return Devices(devices, remotes)
+        errors: list[BaseException] = []
+        failed_group_ids: set[str] = set()
+        for group, result in zip(groups, results, strict=True):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                LOGGER.warning(
+                    "Failed to get devices of group %s: %s", group.groupID, result
+                )
+                errors.append(result)
+                failed_group_ids.add(group.groupID)
+                continue
+            devices.extend(result.devices)
+            remotes.extend(result.remotes)
+        if errors and len(errors) == len(groups):
+            raise ApiError(f"Failed to get devices of all groups: {errors[0]}")
+        return Devices(devices, remotes), failed_group_ids
+
+    async def __get_group_devices(
+        self, url: str, headers: dict[str, str], group: Group
+    ) -> Devices:
+        """Get devices of a group."""
+        requestBody = {"groupID": group.groupID}
+        async with self._session.post(
+            url, headers=headers, data=json.dumps(requestBody)
+        ) as response:
+            if response.status != 200:
+                LOGGER.warning("URL:%s Status:%s", url, response.status)
+                raise ApiError(f"Server error. http status code {response.status}")
+
+            resp = await response.json()
+            if not resp.get("resultCode") or resp["resultCode"] != 100:
+                LOGGER.warning("URL:%s Response:%s", url, resp)
+                raise ApiError(f"Server error. result code {resp.get('resultCode')}")
+            log_response(LOGGER, url, resp)
+            return Devices.from_dict(resp["data"])
 
     async def connect_as_viewer(self, device_id_list: list[str]) -> KvsCredential:
         """Get kvs credential."""
@@ -356,7 +385,7 @@ class SwitchBotApiClient:
             if not resp.get("resultCode") or resp["resultCode"] != 100:
                 LOGGER.warning("URL:%s Response:%s", url, resp)
                 raise ApiError(f"Server error. result code {resp.get('resultCode')}")
-            LOGGER.debug("URL:%s Response:%s", url, resp)
+            log_response(LOGGER, url, resp)
             return KvsCredential(
                 resp["data"]["channels"],
                 resp["data"]["credential"]["access"],
@@ -383,13 +412,11 @@ class SwitchBotApiClient:
             resp = await response.json()
             if not resp.get("resultCode") or resp["resultCode"] != 100:
                 raise ApiError(f"Server error. result code {resp.get('resultCode')}")
-            LOGGER.debug("URL:%s Response:%s", url, resp)
-            data = list[KVSPreset]()
-            for presetDict in resp["data"]["presetList"]:
-                preset = KVSPreset()
-                preset.__dict__.update(presetDict)
-                data.append(preset)
-            return data
+            log_response(LOGGER, url, resp)
+            return [
+                KVSPreset.from_dict(presetDict)
+                for presetDict in resp["data"]["presetList"]
+            ]
 
     async def update_kvs_preset(
         self, device_id: str, group_id: str, is_favorite: bool, name: str, id: str
@@ -417,4 +444,4 @@ class SwitchBotApiClient:
             resp = await response.json()
             if not resp.get("resultCode") or resp["resultCode"] != 100:
                 raise ApiError(f"Server error. result code {resp.get('resultCode')}")
-            LOGGER.debug("URL:%s Response:%s", url, resp)
+            log_response(LOGGER, url, resp)
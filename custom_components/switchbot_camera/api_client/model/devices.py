@@ -2,20 +2,28 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
+from typing import Any
 
+from .parser import PAYLOAD_KEY, as_dict, from_dict
+
+# Fields the integration reads are required, the others default to None.
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
 class DeviceDetail:
     """DeviceDetail."""
 
     device_type: str
-    isEncrypted: bool  # noqa: N815
-    parent_device: str
-    pubtopic: str
-    remote: str
-    subtopic: str
-    support_cmd: list[str]
-    update_time: str
-    version: str
-    wifi_mac: str
+    isEncrypted: bool | None = None  # noqa: N815
+    parent_device: str | None = None
+    pubtopic: str = ""
+    remote: str | None = None
+    subtopic: str = ""
+    support_cmd: list[str] | None = None
+    update_time: str | None = None
+    version: str | None = None
+    wifi_mac: str | None = None
     awsRegion: str | None = None  # noqa: N815
     bucket: str | None = None
     channelARN: str | None = None  # noqa: N815
@@ -27,19 +35,29 @@ class DeviceDetail:
     timeZoneID: str | None = None  # noqa: N815
     deviceRegion: str | None = None  # noqa: N815
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> DeviceDetail:
+        """Create from a dict."""
+        return from_dict(cls, data)
 
+    def as_dict(self) -> dict[str, Any]:
+        """Return as a dict."""
+        return as_dict(self)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
 class Device:
     """Device."""
 
-    ble_version: int
-    cloudServiceAble: bool  # noqa: N815
+    ble_version: int | None = None
+    cloudServiceAble: bool | None = None  # noqa: N815
     device_detail: DeviceDetail
     device_mac: str
     device_name: str
-    groupID: str | None  # noqa: N815
-    roomID: str  # noqa: N815
-    userID: str  # noqa: N815
-    user_name: str
+    groupID: str | None = None  # noqa: N815
+    roomID: str | None = None  # noqa: N815
+    userID: str | None = None  # noqa: N815
+    user_name: str | None = None
     hardware_version: int | None = None
     isGroup: bool | None = None  # noqa: N815
     isMaster: bool | None = None  # noqa: N815
@@ -53,35 +71,55 @@ class Device:
     netConfigAble: bool | None = None  # noqa: N815
     usageTag: str | None = None  # noqa: N815
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Device:
+        """Create from a dict."""
+        return from_dict(cls, data)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return as a dict."""
+        return as_dict(self)
 
+
+@dataclass(frozen=True, slots=True, kw_only=True)
 class Remote:
     """Remote."""
 
-    userID: str  # noqa: N815
-    userName: str  # noqa: N815
-    groupID: str  # noqa: N815
-    roomID: str  # noqa: N815
-    remoteID: str  # noqa: N815
-    remoteName: str  # noqa: N815
-    type_: int
-    isShared: bool  # noqa: N815
-    ownerUserName: str  # noqa: N815
-    ownerUserID: str  # noqa: N815
-    parentHubMac: str  # noqa: N815
-    codeType: str  # noqa: N815
+    userID: str | None = None  # noqa: N815
+    userName: str | None = None  # noqa: N815
+    groupID: str | None = None  # noqa: N815
+    roomID: str | None = None  # noqa: N815
+    remoteID: str | None = None  # noqa: N815
+    remoteName: str | None = None  # noqa: N815
+    type_: int | None = field(default=None, metadata={PAYLOAD_KEY: "type"})
+    isShared: bool | None = None  # noqa: N815
+    ownerUserName: str | None = None  # noqa: N815
+    ownerUserID: str | None = None  # noqa: N815
+    parentHubMac: str | None = None  # noqa: N815
+    codeType: str | None = None  # noqa: N815
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Remote:
+        """Create from a dict."""
+        return from_dict(cls, data)
 
+    def as_dict(self) -> dict[str, Any]:
+        """Return as a dict."""
+        return as_dict(self)
 
+
+@dataclass(frozen=True, slots=True)
 class Devices:
     """Devices."""
 
     devices: list[Device]
     remotes: list[Remote]
 
-    def __init__(
-        self,
-        devices: list[Device],
-        remotes: list[Remote],
-    ) -> None:
-        """Initialize."""
-        self.devices = devices
-        self.remotes = remotes
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Devices:
+        """Create from a dict."""
+        return from_dict(cls, data)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return as a dict."""
+        return as_dict(self)
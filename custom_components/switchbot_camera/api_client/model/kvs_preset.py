@@ -1,6 +1,14 @@
 """SwitchBot Camera KVS Preset model."""
 
+from __future__ import annotations
 
+from dataclasses import dataclass
+from typing import Any
+
+from .parser import as_dict, from_dict
+
+
+@dataclass(frozen=True, slots=True)
 class Position:
     """Position."""
 
@@ -8,11 +16,21 @@ class Position:
     y: int
 
 
+@dataclass(frozen=True, slots=True, kw_only=True)
 class KVSPreset:
     """KVS Preset."""
 
     id: str
     name: str
-    previewUrl: str  # noqa: N815
-    position: Position
-    is_favorite: bool
+    previewUrl: str | None = None  # noqa: N815
+    position: Position | None = None
+    is_favorite: bool | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> KVSPreset:
+        """Create from a dict."""
+        return from_dict(cls, data)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return as a dict."""
+        return as_dict(self)
@@ -0,0 +1,90 @@
+"""Parse payloads into model dataclasses."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import MISSING, dataclass, fields, is_dataclass
+import functools
+import types
+from typing import Any, TypeVar, Union, get_args, get_origin, get_type_hints
+
+_ModelT = TypeVar("_ModelT")
+
+# Metadata key of a field whose payload key differs from its name
+PAYLOAD_KEY = "payload_key"
+
+
+@dataclass(frozen=True, slots=True)
+class _FieldParser:
+    name: str
+    key: str
+    convert: Callable[[Any], Any] | None
+    required: bool
+
+
+def from_dict(cls: type[_ModelT], data: dict[str, Any]) -> _ModelT:
+    """Create a model dataclass from a payload dict.
+
+    Keys without a field are ignored, so new keys sent by the cloud or the
+    firmware do not break parsing. Nested models, lists of models and optional
+    models are parsed as well. A missing field without default raises
+    ValueError.
+    """
+    if not isinstance(data, dict):
+        raise TypeError(f"{cls.__name__} expects a dict, got {type(data).__name__}")
+    kwargs = {}
+    for field_parser in _field_parsers(cls):
+        if field_parser.key not in data:
+            if field_parser.required:
+                raise ValueError(f"{cls.__name__} is missing {field_parser.key}")
+            continue
+        value = data[field_parser.key]
+        if field_parser.convert is not None and value is not None:
+            value = field_parser.convert(value)
+        kwargs[field_parser.name] = value
+    return cls(**kwargs)
+
+
+@functools.cache
+def _field_parsers(cls: type) -> tuple[_FieldParser, ...]:
+    """Return how to parse each field of a model, resolved once per model."""
+    type_hints = get_type_hints(cls)
+    return tuple(
+        _FieldParser(
+            name=model_field.name,
+            key=model_field.metadata.get(PAYLOAD_KEY, model_field.name),
+            convert=_converter(type_hints[model_field.name]),
+            required=model_field.default is MISSING
+            and model_field.default_factory is MISSING,
+        )
+        for model_field in fields(cls)
+    )
+
+
+def _converter(type_hint: Any) -> Callable[[Any], Any] | None:
+    """Return the function parsing a nested model, None for plain values."""
+    origin = get_origin(type_hint)
+    if origin in (Union, types.UnionType):
+        # Optional[Model], None is handled by the caller
+        args = [arg for arg in get_args(type_hint) if arg is not type(None)]
+        return _converter(args[0]) if len(args) == 1 else None
+    if origin is list:
+        (item_type,) = get_args(type_hint)
+        if (convert := _converter(item_type)) is not None:
+            return lambda values: [convert(value) for value in values]
+        return None
+    if is_dataclass(type_hint):
+        return functools.partial(from_dict, type_hint)
+    return None
+
+
+def as_dict(model: Any) -> Any:
+    """Return a model dataclass as a payload dict, the reverse of from_dict."""
+    if isinstance(model, list):
+        return [as_dict(value) for value in model]
+    if not is_dataclass(model):
+        return model
+    return {
+        field_parser.key: as_dict(getattr(model, field_parser.name))
+        for field_parser in _field_parsers(type(model))
+    }
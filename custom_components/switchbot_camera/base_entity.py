@@ -1,17 +1,38 @@
 """Support for SwitchBot KVS Camera Sensors."""
 
-from homeassistant.core import callback
+from collections.abc import Awaitable
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .api_client.api_client import Device
 from .const import DOMAIN
 from .coordinator import SwitchBotKVSCameraCoordinator
+from .mqtt_client.mqtt_kvs_cam import KvsStatus
+
+# How long an acked value is shown when the camera does not push a new status
+OPTIMISTIC_STATE_HOLD_SECONDS = 5
 
 
 class SwitchBotKVSEntity(CoordinatorEntity):
     """Base class for SwitchBot KVS entities."""
 
+    # Whether the entity is backed by the MQTT connection
+    _requires_mqtt = True
+    # Field groups of the camera the state is computed from. The entity is
+    # updated when they change, besides the full coordinator updates.
+    _field_groups: tuple[str, ...] = ()
+    _last_state_fingerprint: tuple[Any, ...] | None = None
+    # Value of a command in flight, shown until the camera pushes a new status
+    _optimistic_value: Any = None
+    _optimistic_status: KvsStatus | None = None
+    _has_optimistic_value = False
+    _unsub_optimistic_hold: CALLBACK_TYPE | None = None
+
     def __init__(
         self, coordinator: SwitchBotKVSCameraCoordinator, device: Device
     ) -> None:
@@ -21,11 +42,98 @@ class SwitchBotKVSEntity(CoordinatorEntity):
         self.device = device
         self._attr_model = device.device_detail.device_type
 
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return super().available and (
+            not self._requires_mqtt or self.coordinator.mqtt_client.is_connected()
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the field groups of the camera."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._cancel_optimistic_hold)
+        if self._field_groups:
+            self.async_on_remove(
+                self.coordinator.async_add_slice_listener(
+                    self.device.device_mac,
+                    self._field_groups,
+                    self._handle_coordinator_update,
+                )
+            )
+
+    def _state_fingerprint(self) -> tuple[Any, ...]:
+        """Return what the written state is made of."""
+        return (
+            self.available,
+            self.state,
+            self.capability_attributes,
+            self.extra_state_attributes,
+        )
+
     @callback
     def _handle_coordinator_update(self) -> None:
-        """Update camera with latest data from coordinator."""
+        """Update camera with latest data from coordinator.
+
+        The state is only written when it changed since the last update.
+        """
+        fingerprint = self._state_fingerprint()
+        if fingerprint == self._last_state_fingerprint:
+            return
+        self._last_state_fingerprint = fingerprint
         self.async_write_ha_state()
 
+    def _optimistic_or(self, value: Any) -> Any:
+        """Return the value of a command in flight, else the given value."""
+        if (
+            self._has_optimistic_value
+            and self.coordinator.data.kvs_statuses.get(self.device.device_mac)
+            is self._optimistic_status
+        ):
+            return self._optimistic_value
+        return value
+
+    @callback
+    def _cancel_optimistic_hold(self) -> None:
+        if self._unsub_optimistic_hold is not None:
+            self._unsub_optimistic_hold()
+            self._unsub_optimistic_hold = None
+
+    @callback
+    def _clear_optimistic_value(self, *_: Any) -> None:
+        self._unsub_optimistic_hold = None
+        self._has_optimistic_value = False
+        self._optimistic_value = None
+        self._handle_coordinator_update()
+
+    async def _async_run_command(
+        self, command: Awaitable[bool] | None, value: Any
+    ) -> None:
+        """Show the value while the camera confirms the command.
+
+        Raises HomeAssistantError when the camera rejects the command or does
+        not answer. Commands without ack are not awaited.
+        """
+        if command is None:
+            return
+        self._cancel_optimistic_hold()
+        self._optimistic_value = value
+        self._optimistic_status = self.coordinator.data.kvs_statuses.get(
+            self.device.device_mac
+        )
+        self._has_optimistic_value = True
+        self._handle_coordinator_update()
+        if not await command:
+            self._clear_optimistic_value()
+            raise HomeAssistantError(
+                f"{self.device.device_name} did not accept the change of "
+                f"{self.entity_id}"
+            )
+        # The camera pushes its status after the ack, keep the value until then
+        self._unsub_optimistic_hold = async_call_later(
+            self.hass, OPTIMISTIC_STATE_HOLD_SECONDS, self._clear_optimistic_value
+        )
+
     @property
     def device_info(self) -> DeviceInfo:
         """Return device information."""
@@ -1,18 +1,19 @@
 """Support for SwitchBot KVS Camera buttons."""
 
-import asyncio
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 import logging
 
 from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
 from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import SwitchBotKVSCameraConfigEntry
 from .api_client.api_client import Device
 from .base_entity import SwitchBotKVSEntity
+from .const import KVS_CAMERA_DEVICE_TYPES
 from .coordinator import SwitchBotKVSCameraCoordinator
 from .mqtt_client.mqtt_kvs_cam import MotorAction, MotorDirection
 
@@ -26,34 +27,39 @@ class ButtonDefinition:
     key: str
     action: Callable[
         [str, SwitchBotKVSCameraCoordinator],
-        None,
+        # Camera commands resolve with whether they were acked
+        Awaitable[bool | None] | None,
     ]
     icon: str
 
 
-def preset_remove(
+async def async_preset_move(
+    device_mac: str,
+    coordinator: SwitchBotKVSCameraCoordinator,
+) -> bool | None:
+    """Move to a preset."""
+    preset_name = coordinator.data.kvs_preset_selects.get(device_mac)
+    if (preset := coordinator.get_preset_by_name(device_mac, preset_name)) is None:
+        _LOGGER.warning("Preset %s of %s not found", preset_name, device_mac)
+        return None
+    command = coordinator.mqtt_kvs_cams[device_mac].trigger_preset(preset.id)
+    return None if command is None else await command
+
+
+async def async_preset_remove(
     device_mac: str,
     coordinator: SwitchBotKVSCameraCoordinator,
 ) -> None:
     """Remove a preset."""
-    group_id = next(
-        device.groupID
-        for device in coordinator.data.devices.devices
-        if device_mac == device.device_mac
-    )
-    preset_id = next(
-        preset.id
-        for preset in coordinator.data.kvs_presets[device_mac]
-        if preset.name == coordinator.data.kvs_preset_selects[device_mac]
+    group_id = coordinator.get_device_by_id(device_mac).groupID
+    preset_name = coordinator.data.kvs_preset_selects.get(device_mac)
+    if (preset := coordinator.get_preset_by_name(device_mac, preset_name)) is None:
+        _LOGGER.warning("Preset %s of %s not found", preset_name, device_mac)
+        return
+    await coordinator.api_client.update_kvs_preset(
+        device_mac, group_id, False, preset_name, preset.id
     )
-    preset_name = coordinator.data.kvs_preset_selects[device_mac]
-    asyncio.run_coroutine_threadsafe(
-        coordinator.api_client.update_kvs_preset(
-            device_mac, group_id, False, preset_name, preset_id
-        ),
-        coordinator.hass.loop,
-    )
-    coordinator.reload_preset(device_mac, group_id)
+    coordinator.async_schedule_preset_reload(device_mac, group_id)
 
 
 BUTTONS: list[ButtonDefinition] = [
@@ -111,20 +117,12 @@ BUTTONS: list[ButtonDefinition] = [
     ),
     ButtonDefinition(
         key="preset_move",
-        action=lambda device_mac, coordinator: (
-            coordinator.mqtt_kvs_cams[device_mac].trigger_preset(
-                next(
-                    preset.id
-                    for preset in coordinator.data.kvs_presets[device_mac]
-                    if preset.name == coordinator.data.kvs_preset_selects[device_mac]
-                )
-            )
-        ),
+        action=async_preset_move,
         icon=None,
     ),
     ButtonDefinition(
         key="preset_remove",
-        action=preset_remove,
+        action=async_preset_remove,
         icon=None,
     ),
 ]
@@ -138,11 +136,7 @@ async def async_setup_entry(
     """Set up the Buttons."""
     coordinator: SwitchBotKVSCameraCoordinator = config_entry.runtime_data.coordinator
     entities: list[SwitchBotKVSButtonEntity] = []
-    for kvsCam in (
-        device
-        for device in coordinator.data.devices.devices
-        if device.device_detail.device_type in ("WoCamKvs5mp", "WoCamKvs")
-    ):
+    for kvsCam in coordinator.get_devices_by_type(KVS_CAMERA_DEVICE_TYPES):
         entities.extend(
             [
                 SwitchBotKVSButtonEntity(
@@ -184,6 +178,10 @@ class SwitchBotKVSButtonEntity(SwitchBotKVSEntity, ButtonEntity):
         )
         self.action = button_definition.action
 
-    def press(self) -> None:
+    async def async_press(self) -> None:
         """Press the button."""
-        self.action(self.device.device_mac, self.coordinator)
+        result = self.action(self.device.device_mac, self.coordinator)
+        if result is not None and await result is False:
+            raise HomeAssistantError(
+                f"{self.device.device_name} did not accept {self.entity_id}"
+            )
@@ -1,5 +1,7 @@
 """Interfaces with the Switch Bot Cameras."""
 
+import asyncio
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 import functools
 from functools import partial
@@ -7,8 +9,10 @@ import json
 import logging
 from pathlib import Path
 import re
+from typing import Any
+from urllib.parse import urljoin
 
-import boto3
+import aiohttp
 from botocore.auth import SigV4QueryAuth
 from botocore.awsrequest import AWSRequest
 from botocore.credentials import Credentials
@@ -27,12 +31,14 @@ from homeassistant.components import ffmpeg
 from homeassistant.components.camera import (
     Camera as CameraEntity,
     CameraEntityFeature,
+    Image,
     WebRTCAnswer as HAWebRTCAnswer,
     WebRTCCandidate as HAWebRTCCandidate,
     WebRTCError,
     WebRTCMessage,
     WebRTCSendMessage,
 )
+from homeassistant.components.camera.img_util import scale_jpeg_camera_image
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -40,13 +46,50 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from . import SwitchBotKVSCameraConfigEntry
 from .api_client.api_client import Device, KvsCredential
 from .base_entity import SwitchBotKVSEntity
-from .const import RESOLUTION, RESOLUTION_HD, SNAPSHOT_ENABLE, SNAPSHOT_INTERVAL
+from .const import (
+    CAMERA_DEVICE_TYPES,
+    KVS_CAMERA_DEVICE_TYPES,
+    RESOLUTION,
+    RESOLUTION_HD,
+    SNAPSHOT_BACKEND,
+    SNAPSHOT_BACKEND_GO2RTC,
+    SNAPSHOT_ENABLE,
+    SNAPSHOT_INTERVAL,
+)
 from .coordinator import SwitchBotKVSCameraCoordinator
+from .kvs_client.kvs_client import IceServerConfig, SignalingChannel
+from .snapshot_cache import get_snapshot_cache
 
 _LOGGER = logging.getLogger(__name__)
 
 PLACEHOLDER = Path(__file__).parent / "placeholder.png"
 
+SIGNALING_CHANNEL_CACHE_DURATION = timedelta(hours=24)
+ICE_SERVER_REFRESH_MARGIN = timedelta(seconds=30)
+SIGNED_URL_EXPIRES_SECONDS = 299
+SIGNED_URL_REFRESH_MARGIN = timedelta(seconds=30)
+GO2RTC_FRAME_TIMEOUT = aiohttp.ClientTimeout(total=15)
+# Cache key of the full resolution frame
+FULL_FRAME = (None, None)
+
+
+@dataclass(frozen=True, slots=True)
+class Go2RtcStreamRegistration:
+    """Producer URL registered in go2rtc for a camera."""
+
+    channel_name: str
+    url: str
+    signed_at: datetime
+
+    def is_expiring(self, now: datetime) -> bool:
+        """Return whether go2rtc could no longer connect with the URL."""
+        return (
+            self.signed_at
+            + timedelta(seconds=SIGNED_URL_EXPIRES_SECONDS)
+            - SIGNED_URL_REFRESH_MARGIN
+            <= now
+        )
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -62,14 +105,11 @@ async def async_setup_entry(
             config_entry.options.get(RESOLUTION, RESOLUTION_HD),
             config_entry.options.get(SNAPSHOT_ENABLE, False),
             config_entry.options.get(SNAPSHOT_INTERVAL, 120),
+            config_entry.options.get(SNAPSHOT_BACKEND, SNAPSHOT_BACKEND_GO2RTC),
             coordinator,
             device,
-            kvs_credential=await coordinator.api_client.connect_as_viewer(
-                [device.device_mac]
-            ),
         )
-        for device in coordinator.data.devices.devices
-        if device.device_detail.device_type in ("WoCamKvs5mp", "WoCamKvs", "W1050000")
+        for device in coordinator.get_devices_by_type(CAMERA_DEVICE_TYPES)
     ]
     async_add_entities(cameras)
 
@@ -77,6 +117,8 @@ async def async_setup_entry(
 class SwitchBotKVSCameraEntity(SwitchBotKVSEntity, CameraEntity):
     """Implementation of a camera."""
 
+    _requires_mqtt = False
+
     def __init__(
         self,
         hass: HomeAssistant,
@@ -84,9 +126,9 @@ class SwitchBotKVSCameraEntity(SwitchBotKVSEntity, CameraEntity):
         resolution: str,
         snapshot_enable: str,
         snapshot_interval: int,
+        snapshot_backend: str,
         coordinator: SwitchBotKVSCameraCoordinator,
         device: Device,
-        kvs_credential: KvsCredential,
     ) -> None:
         """Initialise camera."""
         SwitchBotKVSEntity.__init__(self, coordinator, device)
@@ -95,58 +137,132 @@ class SwitchBotKVSCameraEntity(SwitchBotKVSEntity, CameraEntity):
         self.entry_unique_id = entry_unique_id
         self.resolution = resolution
         self.play_type = (
-            "0"
-            if device.device_detail.device_type in ("WoCamKvs5mp", "WoCamKvs")
-            else "1"
+            "0" if device.device_detail.device_type in KVS_CAMERA_DEVICE_TYPES else "1"
         )
         self.snapshot_enable = snapshot_enable
-        self.kvs_credential = kvs_credential
+        self.snapshot_backend = snapshot_backend
+        self.kvs_credential: KvsCredential | None = None
         self._attr_supported_features = CameraEntityFeature.STREAM
         self._attr_brand = "SwitchBot"
         self._attr_name = "Camera Stream(WebRTC)"
-        self.ice_servers: list[dict[str, str]] | None = None
-        self.channel_arn: str | None = None
-        self.endpoints_by_protocol: dict | None = None
+        self.signaling_channel: SignalingChannel | None = None
+        self.ice_server_config: IceServerConfig | None = None
         self._sessions: dict[str, Go2RtcWsClient] = {}
+        self._go2rtc_stream: Go2RtcStreamRegistration | None = None
+        self._go2rtc_stream_lock = asyncio.Lock()
         self.camera_image_interval = timedelta(seconds=snapshot_interval)
-        self.camera_image_cache: dict[tuple[int, int], tuple[datetime, bytes]] = {}
+        self.camera_image_cache = get_snapshot_cache(hass)
+        # Grab in flight, shared by concurrent requests
+        self._camera_image_task: asyncio.Task[bytes | None] | None = None
         self.entity_id = f"camera.switchbot_camera_{device.device_mac}"
         self.unique_id = f"camera.switchbot_camera_{device.device_mac}"
 
     async def async_camera_image(
         self, width: int | None = None, height: int | None = None
     ) -> bytes | None:
-        """Return a still image response from the camera."""
+        """Return a still image response from the camera.
+
+        One full resolution frame is grabbed per interval, the sizes asked by
+        the frontend are scaled from it and cached next to it.
+        """
 
         isDownload = width is None and height is None
         if not self.snapshot_enable and not isDownload:
             return await self.hass.async_add_executor_job(self.placeholder_image)
         cacheKey = (width, height)
 
-        if (
-            cacheKey in self.camera_image_cache
-            and self.camera_image_cache[cacheKey][0] + self.camera_image_interval
-            > datetime.now(UTC)
-            and len(self.camera_image_cache[cacheKey][1]) != 0
-            and not isDownload
-        ):
+        if not isDownload and (image := self.__get_cached_image(cacheKey)):
             _LOGGER.debug("Cache hit %s %s", width, height)
-            return self.camera_image_cache[cacheKey][1]
+            return image
 
-        rtsp_port = await self._regist_go2rtc_stream_if_not_exists(isDownload)
-        domain = re.search(r"http://([^:/]+)", self.hass.data["go2rtc"]).group(1)
-        stream_source = f"rtsp://{domain}:{rtsp_port}/{self.entity_id}"
-        _LOGGER.debug("stream_source %s", stream_source)
+        # The lookup of the frame to scale is not counted as a request
+        if isDownload or not (
+            frame := self.camera_image_cache.peek((self.entity_id, *FULL_FRAME))
+        ):
+            frame = await self.__async_grab_frame()
+        if not frame or width is None or height is None:
+            return frame
 
-        camera_image_latest = await ffmpeg.async_get_image(
-            self.hass, stream_source, width=width, height=height, extra_cmd="-ss 2"
-        )
-        self.camera_image_cache[cacheKey] = (
-            datetime.now(UTC),
-            camera_image_latest,
+        image = await self.hass.async_add_executor_job(
+            scale_jpeg_camera_image, Image("image/jpeg", frame), width, height
         )
+        # Keep the scaled image only while its frame is the cached one, and no
+        # longer than the frame
+        frame_key = (self.entity_id, *FULL_FRAME)
+        if self.camera_image_cache.peek(frame_key) is frame and (
+            ttl := self.camera_image_cache.ttl_of(frame_key)
+        ):
+            self.camera_image_cache.put((self.entity_id, *cacheKey), image, ttl)
+        return image
+
+    def __get_cached_image(
+        self, cacheKey: tuple[int | None, int | None]
+    ) -> bytes | None:
+        return self.camera_image_cache.get((self.entity_id, *cacheKey))
+
+    async def __async_grab_frame(self) -> bytes | None:
+        """Grab a full resolution frame, shared by concurrent requests."""
+        if (task := self._camera_image_task) is None:
+            task = self._camera_image_task = self.hass.async_create_task(
+                self.__async_grab_frame_from_stream(),
+                f"{self.entity_id} camera image",
+            )
+            task.add_done_callback(self.__clear_camera_image_task)
+        else:
+            _LOGGER.debug("Join in-flight grab")
+        # A cancelled request must not cancel the grab the others wait for
+        return await asyncio.shield(task)
+
+    def __clear_camera_image_task(self, task: asyncio.Task[bytes | None]) -> None:
+        if self._camera_image_task is task:
+            self._camera_image_task = None
+
+    async def __async_grab_frame_from_stream(self) -> bytes | None:
+        rtsp_port = await self._regist_go2rtc_stream_if_not_exists(False)
+        camera_image_latest = None
+        if self.snapshot_backend == SNAPSHOT_BACKEND_GO2RTC:
+            camera_image_latest = await self.__async_get_go2rtc_frame()
+        if not camera_image_latest:
+            domain = re.search(r"http://([^:/]+)", self.hass.data["go2rtc"]).group(1)
+            stream_source = f"rtsp://{domain}:{rtsp_port}/{self.entity_id}"
+            _LOGGER.debug("stream_source %s", stream_source)
+
+            camera_image_latest = await ffmpeg.async_get_image(
+                self.hass, stream_source, extra_cmd="-ss 2"
+            )
+        # Scaled images of the previous frame are outdated
+        self.camera_image_cache.remove_camera(self.entity_id)
+        if camera_image_latest:
+            self.camera_image_cache.put(
+                (self.entity_id, *FULL_FRAME),
+                camera_image_latest,
+                self.camera_image_interval,
+            )
         return camera_image_latest
 
+    async def __async_get_go2rtc_frame(self) -> bytes | None:
+        """Get a JPEG frame of the running stream from go2rtc, None on failure."""
+        try:
+            async with async_get_clientsession(self.hass).get(
+                urljoin(self.hass.data["go2rtc"], "api/frame.jpeg"),
+                params={"src": self.entity_id},
+                timeout=GO2RTC_FRAME_TIMEOUT,
+            ) as resp:
+                resp.raise_for_status()
+                return await resp.read()
+        except (aiohttp.ClientError, TimeoutError) as err:
+            _LOGGER.debug(
+                "go2rtc frame of %s failed, falling back to ffmpeg: %s",
+                self.entity_id,
+                err,
+            )
+            return None
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Drop the cached snapshots of the camera."""
+        await super().async_will_remove_from_hass()
+        self.camera_image_cache.remove_camera(self.entity_id)
+
     @classmethod
     @functools.cache
     def placeholder_image(cls) -> bytes:
@@ -157,33 +273,44 @@ class SwitchBotKVSCameraEntity(SwitchBotKVSEntity, CameraEntity):
         region = self.device.device_detail.awsRegion
         if region is None:
             region = self.device.device_detail.channelARN.split(":")[3]
-        expiration_date = datetime.fromtimestamp(
-            self.kvs_credential.expiration / 1000, tz=UTC
+        self.kvs_credential = await self.coordinator.async_get_kvs_credential(
+            self.device.device_mac
         )
+        # The channel ARN and endpoints are cached for a long time, the ICE
+        # servers for the TTL of their TURN credentials, and the URL is signed
+        # whenever the go2rtc producer is registered.
         current_time = datetime.now(UTC)
-        if expiration_date < current_time or self.channel_arn is None:
-            (
-                channel_arn,
-                endpoints_by_protocol,
-                ice_servers,
-            ) = await self.__get_ice_servers(region)
-            self.ice_servers = ice_servers
-            self.channel_arn = channel_arn
-            self.endpoints_by_protocol = endpoints_by_protocol
+        channel_name = self.kvs_credential.channels[self.device.device_mac]
+        if (
+            self.signaling_channel is None
+            or self.signaling_channel.channel_name != channel_name
+            or self.signaling_channel.expires_at < current_time
+        ):
+            self.signaling_channel = await self.__get_signaling_channel(
+                region, channel_name
+            )
+            self.ice_server_config = None
+        if (
+            self.ice_server_config is None
+            or self.ice_server_config.expires_at < current_time
+        ):
+            self.ice_server_config = await self.__get_ice_servers(region)
 
         auth_credentials = Credentials(
             access_key=self.kvs_credential.access,
             secret_key=self.kvs_credential.secret,
             token=self.kvs_credential.token,
         )
-        SigV4 = SigV4QueryAuth(auth_credentials, "kinesisvideo", region, 299)
+        SigV4 = SigV4QueryAuth(
+            auth_credentials, "kinesisvideo", region, SIGNED_URL_EXPIRES_SECONDS
+        )
         parts = self.entry_unique_id.split("-")
         clientId = f"android_{self.device.device_mac.lower()}_{parts[3]}{parts[4][:4]}_{parts[4][4:]}"
         aws_request = AWSRequest(
             method="GET",
-            url=self.endpoints_by_protocol["WSS"],
+            url=self.signaling_channel.endpoints_by_protocol["WSS"],
             params={
-                "X-Amz-ChannelARN": self.channel_arn,
+                "X-Amz-ChannelARN": self.signaling_channel.channel_arn,
                 "X-Amz-ClientId": clientId,
             },
         )
@@ -201,38 +328,23 @@ class SwitchBotKVSCameraEntity(SwitchBotKVSEntity, CameraEntity):
             + "#client_id="
             + clientId
             + "#ice_servers="
-            + json.dumps(self.ice_servers, separators=(",", ":"))
+            + json.dumps(self.ice_server_config.ice_servers, separators=(",", ":"))
         )
 
-    async def __get_ice_servers(self, region) -> tuple[str, dict, list[dict[str, str]]]:
-        self.kvs_credential = await self.coordinator.get_kvs_credential(
-            self.device.device_mac
-        )
-        # Create a Kinesis Video client
-        kwargs_boto3_client_kinesisvideo = {}
-        kwargs_boto3_client_kinesisvideo["region_name"] = region
-        kwargs_boto3_client_kinesisvideo["aws_access_key_id"] = (
-            self.kvs_credential.access
-        )
-        kwargs_boto3_client_kinesisvideo["aws_secret_access_key"] = (
-            self.kvs_credential.secret
-        )
-        kwargs_boto3_client_kinesisvideo["aws_session_token"] = (
-            self.kvs_credential.token
-        )
+    async def __get_signaling_channel(
+        self, region: str, channel_name: str
+    ) -> SignalingChannel:
+        # Get a Kinesis Video client
         kinesis_video_client = await self.hass.async_add_executor_job(
-            partial(
-                boto3.client,
-                "kinesisvideo",
-                **kwargs_boto3_client_kinesisvideo,
-            )
+            self.coordinator.kvs_client_pool.get_client,
+            "kinesisvideo",
+            region,
+            self.kvs_credential,
         )
 
         # Describe the signaling channel
         kwargs_describe_signaling_channel = {}
-        kwargs_describe_signaling_channel["ChannelName"] = self.kvs_credential.channels[
-            self.device.device_mac
-        ]
+        kwargs_describe_signaling_channel["ChannelName"] = channel_name
         describe_signaling_channel_response = await self.hass.async_add_executor_job(
             partial(
                 kinesis_video_client.describe_signaling_channel,
@@ -264,33 +376,27 @@ class SwitchBotKVSCameraEntity(SwitchBotKVSEntity, CameraEntity):
                 "ResourceEndpointList"
             ]
         }
-        # Create a Kinesis Video Signaling Channels client
-        kwargs_boto3_client_kinesis_video_signaling = {}
-        kwargs_boto3_client_kinesis_video_signaling["region_name"] = region
-        kwargs_boto3_client_kinesis_video_signaling["aws_access_key_id"] = (
-            self.kvs_credential.access
-        )
-        kwargs_boto3_client_kinesis_video_signaling["aws_secret_access_key"] = (
-            self.kvs_credential.secret
-        )
-        kwargs_boto3_client_kinesis_video_signaling["aws_session_token"] = (
-            self.kvs_credential.token
-        )
-        kwargs_boto3_client_kinesis_video_signaling["endpoint_url"] = (
-            endpoints_by_protocol["HTTPS"]
+        return SignalingChannel(
+            channel_name,
+            channel_arn,
+            endpoints_by_protocol,
+            datetime.now(UTC) + SIGNALING_CHANNEL_CACHE_DURATION,
         )
+
+    async def __get_ice_servers(self, region: str) -> IceServerConfig:
+        # Get a Kinesis Video Signaling Channels client
         kinesis_video_signaling_channels_client = (
             await self.hass.async_add_executor_job(
-                partial(
-                    boto3.client,
-                    "kinesis-video-signaling",
-                    **kwargs_boto3_client_kinesis_video_signaling,
-                )
+                self.coordinator.kvs_client_pool.get_client,
+                "kinesis-video-signaling",
+                region,
+                self.kvs_credential,
+                self.signaling_channel.endpoints_by_protocol["HTTPS"],
             )
         )
         # Get ICE server configuration
         kwargs_get_ice_server_config = {}
-        kwargs_get_ice_server_config["ChannelARN"] = channel_arn
+        kwargs_get_ice_server_config["ChannelARN"] = self.signaling_channel.channel_arn
         get_ice_server_config_response = await self.hass.async_add_executor_job(
             partial(
                 kinesis_video_signaling_channels_client.get_ice_server_config,
@@ -306,8 +412,17 @@ class SwitchBotKVSCameraEntity(SwitchBotKVSEntity, CameraEntity):
             }
             for ice_server in get_ice_server_config_response["IceServerList"]
         )
-
-        return channel_arn, endpoints_by_protocol, ice_servers
+        ttl = min(
+            (
+                ice_server.get("Ttl", 0)
+                for ice_server in get_ice_server_config_response["IceServerList"]
+            ),
+            default=0,
+        )
+        return IceServerConfig(
+            ice_servers,
+            datetime.now(UTC) + timedelta(seconds=ttl) - ICE_SERVER_REFRESH_MARGIN,
+        )
 
     async def _regist_go2rtc_stream_if_not_exists(self, isDownload: bool) -> str:
         rest_client = Go2RtcRestClient(
@@ -319,13 +434,20 @@ class SwitchBotKVSCameraEntity(SwitchBotKVSEntity, CameraEntity):
         if isDownload:
             return rtsp_port
 
-        signed_url = await self.__get_signed_url()
-
-        streams = await rest_client.streams.list()
+        async with self._go2rtc_stream_lock:
+            kvs_credential = await self.coordinator.async_get_kvs_credential(
+                self.device.device_mac
+            )
+            channel_name = kvs_credential.channels[self.device.device_mac]
+            resp = await rest_client._client.request(  # noqa: SLF001
+                "GET", "/api/streams"
+            )
+            streams = await resp.json()
+            if self.__is_go2rtc_stream_reusable(streams, channel_name):
+                return rtsp_port
 
-        if (stream := streams.get(self.entity_id)) is None or not any(
-            signed_url == producer.url for producer in stream.producers
-        ):
+            _LOGGER.debug("Register go2rtc stream %s", self.entity_id)
+            signed_url = await self.__get_signed_url()
             await rest_client.streams.add(
                 self.entity_id + "-internal",
                 [signed_url],
@@ -336,9 +458,41 @@ class SwitchBotKVSCameraEntity(SwitchBotKVSEntity, CameraEntity):
                     f"ffmpeg:{self.entity_id}-internal#video=h264#query=log_level=debug",
                 ],
             )
+            self._go2rtc_stream = Go2RtcStreamRegistration(
+                self.kvs_credential.channels[self.device.device_mac],
+                signed_url,
+                datetime.now(UTC),
+            )
 
         return rtsp_port
 
+    def __is_go2rtc_stream_reusable(
+        self, streams: dict[str, Any], channel_name: str
+    ) -> bool:
+        """Return whether the registered producer can serve another consumer.
+
+        The signed URL changes on every signing, so the producer is tracked by
+        the registration instead of by comparing URLs. A running producer is
+        always reused; an idle one as long as go2rtc can still connect with its
+        URL.
+        """
+        registration = self._go2rtc_stream
+        if (
+            registration is None
+            or registration.channel_name != channel_name
+            or not streams.get(self.entity_id)
+            or not (internal_stream := streams.get(self.entity_id + "-internal"))
+        ):
+            return False
+        producers = internal_stream.get("producers") or []
+        # go2rtc lists the connection details of a running producer, only the
+        # URL of an idle one
+        if any(producer.keys() - {"url"} for producer in producers):
+            return True
+        return any(
+            producer.get("url") == registration.url for producer in producers
+        ) and not registration.is_expiring(datetime.now(UTC))
+
     async def async_handle_async_webrtc_offer(
         self, offer_sdp: str, session_id: str, send_message: WebRTCSendMessage
     ) -> None:
@@ -360,6 +514,8 @@ class SwitchBotKVSCameraEntity(SwitchBotKVSEntity, CameraEntity):
                 case WebRTCAnswer():
                     value = HAWebRTCAnswer(message.sdp)
                 case WsError():
+                    # Sign a new producer URL on the next offer
+                    self._go2rtc_stream = None
                     value = WebRTCError("go2rtc_webrtc_offer_failed", message.error)
 
             send_message(value)
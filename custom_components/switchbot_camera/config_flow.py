@@ -24,9 +24,14 @@ from .api_client.api_client import SwitchBotApiClient
 from .api_client.exceptions import ApiError
 from .const import (
     DOMAIN,
+    MQTT_DEBUG_SAMPLE_RATE,
+    MQTT_DEBUG_SAMPLE_RATE_DEFAULT,
     RESOLUTION,
     RESOLUTION_HD,
     RESOLUTION_SD,
+    SNAPSHOT_BACKEND,
+    SNAPSHOT_BACKEND_FFMPEG,
+    SNAPSHOT_BACKEND_GO2RTC,
     SNAPSHOT_ENABLE,
     SNAPSHOT_INTERVAL,
 )
@@ -179,6 +184,27 @@ class OptionsFlowHandler(OptionsFlow):
                     SNAPSHOT_INTERVAL,
                     default=self.options.get(SNAPSHOT_INTERVAL, 120),
                 ): (vol.All(vol.Coerce(int), vol.Clamp(min=60))),
+                vol.Required(
+                    SNAPSHOT_BACKEND,
+                    default=self.options.get(SNAPSHOT_BACKEND, SNAPSHOT_BACKEND_GO2RTC),
+                ): selector(
+                    {
+                        "select": {
+                            "options": [
+                                SNAPSHOT_BACKEND_GO2RTC,
+                                SNAPSHOT_BACKEND_FFMPEG,
+                            ],
+                            "mode": "dropdown",
+                            "sort": False,
+                        }
+                    }
+                ),
+                vol.Required(
+                    MQTT_DEBUG_SAMPLE_RATE,
+                    default=self.options.get(
+                        MQTT_DEBUG_SAMPLE_RATE, MQTT_DEBUG_SAMPLE_RATE_DEFAULT
+                    ),
+                ): (vol.All(vol.Coerce(int), vol.Clamp(min=1))),
             }
         )
 
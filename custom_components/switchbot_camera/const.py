@@ -12,3 +12,15 @@ RESOLUTION_SD = "SD"
 
 SNAPSHOT_INTERVAL = "snapshot_interval"
 SNAPSHOT_ENABLE = "snapshot_enable"
+SNAPSHOT_BACKEND = "snapshot_backend"
+SNAPSHOT_BACKEND_GO2RTC = "go2rtc"
+SNAPSHOT_BACKEND_FFMPEG = "ffmpeg"
+
+# Cameras streaming over KVS, and the ones also controlled over MQTT
+CAMERA_DEVICE_TYPES = ("WoCamKvs5mp", "WoCamKvs", "W1050000")
+KVS_CAMERA_DEVICE_TYPES = ("WoCamKvs5mp", "WoCamKvs")
+
+# Log one out of every n received messages per MQTT topic at debug level,
+# 1 logs every message
+MQTT_DEBUG_SAMPLE_RATE = "mqtt_debug_sample_rate"
+MQTT_DEBUG_SAMPLE_RATE_DEFAULT = 1
@@ -1,13 +1,20 @@
 """SwitchBot KVSCamera coordinator."""
 
 import asyncio
+from collections.abc import Iterable
 from dataclasses import dataclass
-from datetime import timedelta
+from datetime import UTC, datetime, timedelta
+import functools
+import time
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import APPLICATION_NAME
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api_client.api_client import (
@@ -18,7 +25,16 @@ from .api_client.api_client import (
     SwitchBotApiClient,
 )
 from .api_client.exceptions import ApiError
-from .const import DOMAIN, LOGGER
+from .const import (
+    CAMERA_DEVICE_TYPES,
+    DOMAIN,
+    KVS_CAMERA_DEVICE_TYPES,
+    LOGGER,
+    MQTT_DEBUG_SAMPLE_RATE,
+    MQTT_DEBUG_SAMPLE_RATE_DEFAULT,
+)
+from .kvs_client.kvs_client import KinesisVideoClientPool
+from .mqtt_client.command_tracker import CommandTracker
 from .mqtt_client.mqtt_client import SwitchBotMqttClient
 from .mqtt_client.mqtt_kvs_cam import (
     KvsStatus,
@@ -29,6 +45,45 @@ from .mqtt_client.mqtt_kvs_cam import (
 
 CONNECT_FAILED_NOT_AUTHORISED = 5
 
+# Presets only change through createPreset/updatePreset, which reload them
+# explicitly, so the periodic refresh only needs to catch edits from the app.
+PRESET_REFRESH_INTERVAL = timedelta(hours=1)
+
+# The shared viewer credential is refreshed this long before it expires.
+KVS_CREDENTIAL_REFRESH_MARGIN = timedelta(minutes=5)
+KVS_CREDENTIAL_RETRY_INTERVAL = timedelta(minutes=1)
+
+MQTT_CONNECT_TIMEOUT = timedelta(seconds=30)
+
+# Field groups pushed by the cameras over MQTT. A group is only requested on
+# an update tick when it was not pushed within its interval; the status is
+# also pushed after every acked command.
+FIELD_GROUP_STATUS = "status"
+FIELD_GROUP_SD_CARD_CAPACITY = "sd_card_capacity"
+FIELD_GROUP_WIFI_INFO = "wifi_info"
+# Field groups only changed by the integration itself
+FIELD_GROUP_PRESETS = "presets"
+FIELD_GROUP_RTSP = "rtsp"
+FIELD_GROUP_REFRESH_INTERVALS = {
+    FIELD_GROUP_STATUS: timedelta(minutes=4),
+    FIELD_GROUP_SD_CARD_CAPACITY: timedelta(minutes=30),
+    FIELD_GROUP_WIFI_INFO: timedelta(minutes=30),
+}
+
+# MQTT pushes landing within this window are dispatched to the entities once
+UPDATE_COALESCE_WINDOW = timedelta(milliseconds=250)
+# Preset reloads requested within this time, e.g. by several createPreset
+# acks in a row, are merged into one fetch after the first
+PRESET_RELOAD_COOLDOWN = timedelta(seconds=2)
+
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10
+
+
+def storage_key(entry_id: str) -> str:
+    """Return the storage key of the device snapshot of a config entry."""
+    return f"{DOMAIN}.{entry_id}"
+
 
 @dataclass
 class CoordinatorData:
@@ -45,13 +100,33 @@ class CoordinatorData:
     kvs_rtsp_password: dict[str, str] | None = None
 
 
+@dataclass
+class UpdateNotifyMetrics:
+    """Counters of the coalesced update notifications."""
+
+    requested: int = 0
+    dispatched: int = 0
+    last_merged: int = 0
+    max_merged: int = 0
+
+    @property
+    def merged(self) -> int:
+        """Return how many notifications were merged into another one."""
+        return self.requested - self.dispatched
+
+
 class SwitchBotKVSCameraCoordinator(DataUpdateCoordinator):
     """SwitchBot KVSCamera coordinator."""
 
     data: CoordinatorData
     mqtt_kvs_cams: dict[str, SwitchBotMqttKVSCam]
 
-    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        update_coalesce_window: timedelta = UPDATE_COALESCE_WINDOW,
+    ) -> None:
         """Initialize coordinator."""
 
         self.api_credential = SwitchBotApiClient.ApiCredential(
@@ -85,6 +160,41 @@ class SwitchBotKVSCameraCoordinator(DataUpdateCoordinator):
             api_credential=self.api_credential,
             save_refreshed_token=self.save_refreshed_token,
         )
+        self._preset_fetched_at: dict[str, float] = {}
+        self._preset_reload_debouncers: dict[str, Debouncer] = {}
+        # Lookup indexes, rebuilt when the devices or presets are replaced
+        self._devices_by_mac: dict[str, Device] = {}
+        self._devices_by_group: dict[str | None, list[Device]] = {}
+        self._devices_by_type: dict[str, list[Device]] = {}
+        self._presets_by_name: dict[str, dict[str, KVSPreset]] = {}
+        self._presets_by_id: dict[str, dict[str, KVSPreset]] = {}
+        self._preset_versions: dict[str, int] = {}
+        self._preset_options: dict[str, list[str]] = {}
+        self._field_group_refreshed_at: dict[str, dict[str, float]] = {}
+        self.update_notify_metrics = UpdateNotifyMetrics()
+        self.command_tracker = CommandTracker()
+        self._pending_update_notifies = 0
+        self._changed_slices: set[tuple[str, str]] = set()
+        self._slice_listeners: dict[tuple[str, str], set[CALLBACK_TYPE]] = {}
+        self._update_notify_debouncer = Debouncer(
+            hass,
+            LOGGER,
+            cooldown=update_coalesce_window.total_seconds(),
+            immediate=False,
+            function=self._async_dispatch_update,
+        )
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, storage_key(config_entry.entry_id), private=True
+        )
+        self._snapshot_camera_macs: set[str] | None = None
+        # Last snapshot loaded or scheduled to be written
+        self._stored_snapshot: dict[str, Any] | None = None
+        self._snapshot_save_scheduled = False
+        self._warm_start = False
+        self._kvs_credential: KvsCredential | None = None
+        self._kvs_credential_lock = asyncio.Lock()
+        self._unsub_kvs_credential_refresh: CALLBACK_TYPE | None = None
+        self.kvs_client_pool = KinesisVideoClientPool()
         self.mqtt_client = SwitchBotMqttClient(
             device_id=config_entry.data["device_id"],
             mqtt_self_signed_endpoint=config_entry.data["mqtt_self_signed_endpoint"],
@@ -98,7 +208,12 @@ class SwitchBotKVSCameraCoordinator(DataUpdateCoordinator):
                 f"switchlink/{config_entry.data['user_id']}/#",
                 f"v1_1/{config_entry.data['user_id']}/#",
             ],
+            on_connection_change=self._async_on_mqtt_connection_change,
+            debug_sample_rate=config_entry.options.get(
+                MQTT_DEBUG_SAMPLE_RATE, MQTT_DEBUG_SAMPLE_RATE_DEFAULT
+            ),
         )
+        self.mqtt_kvs_cams = {}
 
     def save_refreshed_token(self) -> None:
         """Save the refreshed token."""
@@ -115,24 +230,55 @@ class SwitchBotKVSCameraCoordinator(DataUpdateCoordinator):
 
         self.hass.add_job(async_update_entry)
 
-    def unload(self) -> None:
-        """Unload the coordinator."""
+    async def async_unload(self) -> None:
+        """Unload the coordinator.
+
+        A snapshot waiting for its delayed write is written before returning, so
+        it cannot be written after the config entry is removed.
+        """
+        self._cancel_kvs_credential_refresh()
+        self._update_notify_debouncer.async_cancel()
+        for debouncer in self._preset_reload_debouncers.values():
+            debouncer.async_cancel()
+        self.command_tracker.cancel_all()
+        self.hass.async_add_executor_job(self.kvs_client_pool.evict)
         self.mqtt_client.stop()
+        if self._snapshot_save_scheduled:
+            self._snapshot_save_scheduled = False
+            await self._store.async_save(self._stored_snapshot)
 
     async def _async_setup(self) -> None:
-        """Do initialization logic."""
-        try:
-            self.data = CoordinatorData()
-            self.data.devices = await self.api_client.get_all_devices()
-        except ApiError as err:
-            LOGGER.error(err)
-            raise UpdateFailed(err) from err
-        except Exception as err:
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
+        """Do initialization logic.
+
+        When a device snapshot was stored by a previous run, entities are set up
+        from it and reconciled with the cloud in the background.
+        """
+        self.data = CoordinatorData()
+        # Also cancelled when the setup fails, async_unload is not called then
+        self.config_entry.async_on_unload(self._cancel_kvs_credential_refresh)
+        snapshot = await self._async_load_snapshot()
+        if snapshot is not None:
+            self._set_devices(snapshot[0])
+            self._snapshot_camera_macs = self._camera_macs()
+            self._warm_start = True
+        else:
+            await self._async_fetch_devices()
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_scheduled_kvs_credential_refresh(),
+            f"{DOMAIN} kvs credential prefetch",
+        )
         self.mqtt_client.start()
 
-        while not self.mqtt_client.is_connected():
-            await asyncio.sleep(1)
+        try:
+            async with asyncio.timeout(MQTT_CONNECT_TIMEOUT.total_seconds()):
+                await self.mqtt_client.async_wait_connected()
+        except TimeoutError:
+            # Entities stay unavailable until the connection is made
+            LOGGER.warning(
+                "MQTT broker did not accept the connection within %s seconds",
+                MQTT_CONNECT_TIMEOUT.total_seconds(),
+            )
 
         parts = self.config_entry.unique_id.split("-")
         self.mqtt_kvs_cams = {}
@@ -144,11 +290,7 @@ class SwitchBotKVSCameraCoordinator(DataUpdateCoordinator):
         self.data.kvs_preset_selects = {}
         self.data.kvs_rtsp_username = {}
         self.data.kvs_rtsp_password = {}
-        for kvsCam in (
-            device
-            for device in self.data.devices.devices
-            if device.device_detail.device_type in ("WoCamKvs5mp", "WoCamKvs")
-        ):
+        for kvsCam in self.get_devices_by_type(KVS_CAMERA_DEVICE_TYPES):
             mqtt_kvs_cam = SwitchBotMqttKVSCam(
                 mqtt_client=self.mqtt_client,
                 device=kvsCam,
@@ -157,98 +299,491 @@ class SwitchBotKVSCameraCoordinator(DataUpdateCoordinator):
                 update_sd_card_capacity=self.update_sd_card_capacity,
                 update_wifi_info=self.update_wifi_info,
                 complete_create_preset=self.complete_create_preset,
+                command_tracker=self.command_tracker,
             )
             self.mqtt_kvs_cams[kvsCam.device_mac] = mqtt_kvs_cam
-            # Update the KVS status
-            mqtt_kvs_cam.request_device_status()
-            # Update the SD card capacity
-            mqtt_kvs_cam.request_sd_card_capacity()
-            # Update the WiFi info
-            mqtt_kvs_cam.request_wifi_info()
-            # Update the KVS presets
-            self.data.kvs_presets[
-                kvsCam.device_mac
-            ] = await self.api_client.list_kvs_preset(kvsCam.device_mac, kvsCam.groupID)
+            self._set_presets(kvsCam.device_mac, [])
             self.data.kvs_preset_texts[kvsCam.device_mac] = ""
             self.data.kvs_preset_selects[kvsCam.device_mac] = ""
             self.data.kvs_rtsp_username[kvsCam.device_mac] = ""
             self.data.kvs_rtsp_password[kvsCam.device_mac] = ""
+        # Update the KVS status, SD card capacity and WiFi info
+        self._request_stale_field_groups()
+        if snapshot is not None:
+            for device_mac, presets in snapshot[1].items():
+                if device_mac in self.data.kvs_presets:
+                    self._set_presets(device_mac, presets)
+        else:
+            # Update the KVS presets
+            await self._async_refresh_presets(force=True)
+
+    async def _async_load_snapshot(
+        self,
+    ) -> tuple[Devices, dict[str, list[KVSPreset]]] | None:
+        """Load the device snapshot stored by a previous run."""
+        if (stored := await self._store.async_load()) is None:
+            return None
+        self._stored_snapshot = stored
+        try:
+            return (
+                Devices.from_dict(stored["devices"]),
+                {
+                    device_mac: [KVSPreset.from_dict(preset) for preset in presets]
+                    for device_mac, presets in stored["kvs_presets"].items()
+                },
+            )
+        except (KeyError, TypeError, ValueError) as err:
+            LOGGER.warning("Ignore invalid device snapshot: %s", err)
+            return None
+
+    @callback
+    def _async_reconcile_snapshot(self) -> None:
+        """Reload when the cameras changed since the snapshot, store a new one."""
+        if self._snapshot_camera_macs is not None:
+            if self._snapshot_camera_macs != self._camera_macs():
+                LOGGER.info("Cameras changed since the stored snapshot, reloading")
+                self.hass.config_entries.async_schedule_reload(
+                    self.config_entry.entry_id
+                )
+            self._snapshot_camera_macs = None
+        if (snapshot := self._snapshot_to_store()) != self._stored_snapshot:
+            self._stored_snapshot = snapshot
+            self._snapshot_save_scheduled = True
+            self._store.async_delay_save(self._snapshot_to_write, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _snapshot_to_write(self) -> dict[str, Any]:
+        """Return the snapshot when its delayed write runs."""
+        self._snapshot_save_scheduled = False
+        return self._stored_snapshot
+
+    @callback
+    def _snapshot_to_store(self) -> dict[str, Any]:
+        """Return the device snapshot to store."""
+        return {
+            "devices": self.data.devices.as_dict(),
+            "kvs_presets": {
+                device_mac: [preset.as_dict() for preset in presets]
+                for device_mac, presets in self.data.kvs_presets.items()
+            },
+        }
+
+    def _camera_macs(self) -> set[str]:
+        """Return the macs of the cameras in the current devices."""
+        return {
+            device.device_mac
+            for device in self.get_devices_by_type(CAMERA_DEVICE_TYPES)
+        }
+
+    @callback
+    def _async_on_mqtt_connection_change(self, connected: bool) -> None:
+        """Handle the MQTT connection being established or lost."""
+        if connected:
+            # Catch up on status changes missed while disconnected
+            self._request_stale_field_groups(force_status=True)
+        self.async_update_listeners()
+
+    @callback
+    def _request_stale_field_groups(self, force_status: bool = False) -> None:
+        """Request the field groups of the cameras that were not pushed recently."""
+        now = time.monotonic()
+        for device_mac, mqtt_kvs_cam in self.mqtt_kvs_cams.items():
+            refreshed_at = self._field_group_refreshed_at.get(device_mac, {})
+            for field_group, request in (
+                (FIELD_GROUP_STATUS, mqtt_kvs_cam.request_device_status),
+                (FIELD_GROUP_SD_CARD_CAPACITY, mqtt_kvs_cam.request_sd_card_capacity),
+                (FIELD_GROUP_WIFI_INFO, mqtt_kvs_cam.request_wifi_info),
+            ):
+                if (
+                    force_status and field_group == FIELD_GROUP_STATUS
+                ) or now - refreshed_at.get(
+                    field_group, float("-inf")
+                ) >= FIELD_GROUP_REFRESH_INTERVALS[field_group].total_seconds():
+                    request()
+
+    def _field_group_refreshed(self, device_mac: str, field_group: str) -> None:
+        """Record that a field group of a camera was pushed."""
+        self._field_group_refreshed_at.setdefault(device_mac, {})[field_group] = (
+            time.monotonic()
+        )
 
     def on_kvs_status_update(self, device_mac: str, kvs_status: KvsStatus) -> None:
         """Handle kvs status update."""
+        previous = self.data.kvs_statuses.get(device_mac)
         self.data.kvs_statuses[device_mac] = kvs_status
-        self.data.kvs_rtsp_username[device_mac] = kvs_status.rtsp["userName"]
-        self.data.kvs_rtsp_password[device_mac] = kvs_status.rtsp["password"]
+        self._field_group_refreshed(device_mac, FIELD_GROUP_STATUS)
+        changed = []
+        if previous != kvs_status:
+            changed.append(FIELD_GROUP_STATUS)
+        if kvs_status.rtsp is not None and (
+            self.data.kvs_rtsp_username.get(device_mac) != kvs_status.rtsp.userName
+            or self.data.kvs_rtsp_password.get(device_mac) != kvs_status.rtsp.password
+        ):
+            self.data.kvs_rtsp_username[device_mac] = kvs_status.rtsp.userName
+            self.data.kvs_rtsp_password[device_mac] = kvs_status.rtsp.password
+            changed.append(FIELD_GROUP_RTSP)
 
         # Notify the coordinator that the data has changed
-        self.hass.loop.call_soon_threadsafe(self.async_set_updated_data, self.data)
+        self.async_notify_updated(device_mac, *changed)
 
+    @callback
     def complete_create_preset(self, device_mac: str, group_id: str) -> None:
         """Handle complete create preset."""
         self.data.kvs_preset_texts[device_mac] = ""
-        self.reload_preset(device_mac, group_id)
+        self.async_notify_updated(device_mac, FIELD_GROUP_PRESETS)
+        self.async_schedule_preset_reload(device_mac, group_id)
+
+    @callback
+    def async_schedule_preset_reload(self, device_mac: str, group_id: str) -> None:
+        """Reload the presets of a camera in the background.
+
+        Requests made while a reload is cooling down are merged into one.
+        """
+        if (debouncer := self._preset_reload_debouncers.get(device_mac)) is None:
+            debouncer = self._preset_reload_debouncers[device_mac] = Debouncer(
+                self.hass,
+                LOGGER,
+                cooldown=PRESET_RELOAD_COOLDOWN.total_seconds(),
+                immediate=True,
+                function=functools.partial(
+                    self._async_reload_preset, device_mac, group_id
+                ),
+            )
+        debouncer.async_schedule_call()
 
-    def reload_preset(self, device_mac: str, group_id: str) -> None:
-        """Reload preset."""
-        self.data.kvs_presets[device_mac] = asyncio.run_coroutine_threadsafe(
-            self.api_client.list_kvs_preset(device_mac, group_id), self.hass.loop
-        ).result()
-        self.hass.loop.call_soon_threadsafe(self.async_set_updated_data, self.data)
+    async def _async_reload_preset(self, device_mac: str, group_id: str) -> None:
+        """Reload the presets of a camera."""
+        try:
+            presets = await self.api_client.list_kvs_preset(device_mac, group_id)
+        except Exception as err:  # noqa: BLE001
+            LOGGER.warning("Failed to reload presets of %s: %s", device_mac, err)
+            return
+        self._preset_fetched_at[device_mac] = time.monotonic()
+        if self._set_presets(device_mac, presets):
+            self.async_notify_updated(device_mac, FIELD_GROUP_PRESETS)
+
+    @callback
+    def async_add_slice_listener(
+        self,
+        device_mac: str,
+        field_groups: tuple[str, ...],
+        update_callback: CALLBACK_TYPE,
+    ) -> CALLBACK_TYPE:
+        """Listen for changes of some field groups of a camera.
+
+        Returns a function to remove the listener.
+        """
+        slices = [(device_mac, field_group) for field_group in field_groups]
+        for data_slice in slices:
+            self._slice_listeners.setdefault(data_slice, set()).add(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            for data_slice in slices:
+                if (listeners := self._slice_listeners.get(data_slice)) is not None:
+                    listeners.discard(update_callback)
+                    if not listeners:
+                        del self._slice_listeners[data_slice]
+
+        return remove_listener
+
+    @callback
+    def async_notify_updated(self, device_mac: str, *field_groups: str) -> None:
+        """Notify the listeners of the field groups of a camera updated in place.
+
+        Notifications within the coalesce window are merged into one dispatch.
+        """
+        if not field_groups:
+            return
+        self._changed_slices.update(
+            (device_mac, field_group) for field_group in field_groups
+        )
+        self.update_notify_metrics.requested += 1
+        self._pending_update_notifies += 1
+        self._update_notify_debouncer.async_schedule_call()
+
+    @callback
+    def _async_dispatch_update(self) -> None:
+        """Dispatch the merged update notifications to the entities."""
+        metrics = self.update_notify_metrics
+        metrics.dispatched += 1
+        metrics.last_merged = self._pending_update_notifies - 1
+        metrics.max_merged = max(metrics.max_merged, metrics.last_merged)
+        self._pending_update_notifies = 0
+        if metrics.last_merged:
+            LOGGER.debug("Merged %s update notifications", metrics.last_merged)
+        changed_slices, self._changed_slices = self._changed_slices, set()
+        update_callbacks = {
+            update_callback
+            for data_slice in changed_slices
+            for update_callback in self._slice_listeners.get(data_slice, ())
+        }
+        for update_callback in update_callbacks:
+            update_callback()
 
     def update_sd_card_capacity(
         self, device_mac: str, sd_card_capacity: SdCardCapacity
     ) -> None:
         """Handle sd card capacity update."""
+        previous = self.data.kvs_sd_card_capacities.get(device_mac)
         self.data.kvs_sd_card_capacities[device_mac] = sd_card_capacity
+        self._field_group_refreshed(device_mac, FIELD_GROUP_SD_CARD_CAPACITY)
 
-        # Notify the coordinator that the data has changed
-        self.hass.loop.call_soon_threadsafe(self.async_set_updated_data, self.data)
+        if previous != sd_card_capacity:
+            # Notify the coordinator that the data has changed
+            self.async_notify_updated(device_mac, FIELD_GROUP_SD_CARD_CAPACITY)
 
     def update_wifi_info(self, device_mac: str, wifi_info: WiFiInfo) -> None:
         """Handle wifi info update."""
+        previous = self.data.kvs_wifi_infos.get(device_mac)
         self.data.kvs_wifi_infos[device_mac] = wifi_info
-        # Notify the coordinator that the data has changed
-        self.hass.loop.call_soon_threadsafe(self.async_set_updated_data, self.data)
+        self._field_group_refreshed(device_mac, FIELD_GROUP_WIFI_INFO)
+        if previous != wifi_info:
+            # Notify the coordinator that the data has changed
+            self.async_notify_updated(device_mac, FIELD_GROUP_WIFI_INFO)
 
     async def _async_update_data(self):
         """Fetch data from API endpoint."""
+        if self._warm_start:
+            # Entities are set up from the snapshot, reconcile in the background
+            self._warm_start = False
+            self.config_entry.async_create_background_task(
+                self.hass, self.async_refresh(), f"{DOMAIN} reconcile snapshot"
+            )
+            return self.data
+
+        complete = await self._async_fetch_devices()
+
+        # Update the KVS status, SD card capacity and WiFi info not pushed since
+        # the last tick
+        self._request_stale_field_groups()
+        # Update the KVS presets
+        await self._async_refresh_presets()
+
+        # A partial device list is neither compared with nor stored as the
+        # snapshot
+        if complete:
+            self._async_reconcile_snapshot()
+
+        # What is returned here is stored in self.data by the DataUpdateCoordinator
+        return self.data
+
+    async def _async_refresh_presets(self, force: bool = False) -> None:
+        """Fetch the preset lists of the KVS cameras concurrently.
+
+        Without force, only cameras whose presets are older than
+        PRESET_REFRESH_INTERVAL are fetched.
+        """
+        now = time.monotonic()
+        devices = [
+            mqtt_kvs_cam.device
+            for mqtt_kvs_cam in self.mqtt_kvs_cams.values()
+            if force
+            or now
+            - self._preset_fetched_at.get(mqtt_kvs_cam.device.device_mac, float("-inf"))
+            >= PRESET_REFRESH_INTERVAL.total_seconds()
+        ]
+        if not devices:
+            return
+        results = await asyncio.gather(
+            *(
+                self.api_client.list_kvs_preset(device.device_mac, device.groupID)
+                for device in devices
+            ),
+            return_exceptions=True,
+        )
+        for device, result in zip(devices, results, strict=True):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                LOGGER.warning(
+                    "Failed to get presets of %s: %s", device.device_mac, result
+                )
+                continue
+            self._set_presets(device.device_mac, result)
+            self._preset_fetched_at[device.device_mac] = now
+
+    async def _async_fetch_devices(self) -> bool:
+        """Fetch the devices, return whether every group was fetched.
+
+        The devices of the groups that could not be fetched are kept from the
+        previous fetch.
+        """
         try:
-            self.data.devices = await self.api_client.get_all_devices()
+            devices, failed_group_ids = await self.api_client.get_all_devices()
         except ApiError as err:
             LOGGER.error(err)
             raise UpdateFailed(err) from err
         except Exception as err:
             raise UpdateFailed(f"Error communicating with API: {err}") from err
-
-        for mqtt_kvs_cam in self.mqtt_kvs_cams.values():
-            # Update the KVS status
-            mqtt_kvs_cam.request_device_status()
-            # Update the SD card capacity
-            mqtt_kvs_cam.request_sd_card_capacity()
-            # Update the WiFi info
-            mqtt_kvs_cam.request_wifi_info()
-            # Update the KVS presets
-            self.data.kvs_presets[
-                mqtt_kvs_cam.device.device_mac
-            ] = await self.api_client.list_kvs_preset(
-                mqtt_kvs_cam.device.device_mac, mqtt_kvs_cam.device.groupID
+        if failed_group_ids and (previous := self.data.devices) is not None:
+            devices = Devices(
+                devices.devices
+                + [
+                    device
+                    for device in previous.devices
+                    if device.groupID in failed_group_ids
+                ],
+                devices.remotes
+                + [
+                    remote
+                    for remote in previous.remotes
+                    if remote.groupID in failed_group_ids
+                ],
             )
-
-        # What is returned here is stored in self.data by the DataUpdateCoordinator
-        return self.data
+        self._set_devices(devices)
+        return not failed_group_ids
+
+    def _set_devices(self, devices: Devices) -> None:
+        """Replace the devices and rebuild their indexes."""
+        self.data.devices = devices
+        self._devices_by_mac = {}
+        self._devices_by_group = {}
+        self._devices_by_type = {}
+        for device in devices.devices:
+            self._devices_by_mac[device.device_mac] = device
+            self._devices_by_group.setdefault(device.groupID, []).append(device)
+            self._devices_by_type.setdefault(
+                device.device_detail.device_type, []
+            ).append(device)
+
+    def _set_presets(self, device_mac: str, presets: list[KVSPreset]) -> bool:
+        """Replace the presets of a camera and rebuild their indexes.
+
+        Returns whether the presets changed, which bumps their version.
+        """
+        if (
+            device_mac in self._preset_versions
+            and self.data.kvs_presets.get(device_mac) == presets
+        ):
+            return False
+        self.data.kvs_presets[device_mac] = presets
+        self._presets_by_name[device_mac] = {preset.name: preset for preset in presets}
+        self._presets_by_id[device_mac] = {preset.id: preset for preset in presets}
+        self._preset_options[device_mac] = ["", *self._presets_by_name[device_mac]]
+        self._preset_versions[device_mac] = self._preset_versions.get(device_mac, 0) + 1
+        return True
 
     def get_device_by_id(self, device_mac: str) -> Device | None:
         """Return device by device id."""
-        # Called by the binary sensors and sensors to get their updated data from self.data
-        try:
-            return [
-                device
-                for device in self.data.devices
-                if device.device_mac == device_mac
-            ][0]
-        except IndexError:
-            return None
+        return self._devices_by_mac.get(device_mac)
 
-    def get_kvs_credential(self, device_mac: str) -> KvsCredential | None:
-        """Return KvsCredential."""
-        return self.api_client.connect_as_viewer([device_mac])
+    def get_devices_by_group(self, group_id: str | None) -> list[Device]:
+        """Return the devices of a group."""
+        return self._devices_by_group.get(group_id, [])
+
+    def get_devices_by_type(self, device_types: Iterable[str]) -> list[Device]:
+        """Return the devices of some device types."""
+        return [
+            device
+            for device_type in device_types
+            for device in self._devices_by_type.get(device_type, ())
+        ]
+
+    def get_preset_by_name(self, device_mac: str, name: str | None) -> KVSPreset | None:
+        """Return a preset of a camera by name."""
+        return self._presets_by_name.get(device_mac, {}).get(name)
+
+    def get_preset_by_id(self, device_mac: str, preset_id: str) -> KVSPreset | None:
+        """Return a preset of a camera by id."""
+        return self._presets_by_id.get(device_mac, {}).get(preset_id)
+
+    def get_preset_version(self, device_mac: str) -> int:
+        """Return the version of the presets of a camera, bumped on every change."""
+        return self._preset_versions.get(device_mac, 0)
+
+    def get_preset_options(self, device_mac: str) -> list[str] | None:
+        """Return the preset names of a camera, after an empty option.
+
+        The list is cached until the presets change and must not be modified.
+        """
+        return self._preset_options.get(device_mac)
+
+    async def async_get_kvs_credential(self, device_mac: str) -> KvsCredential:
+        """Return the shared KVS viewer credential for a camera.
+
+        The credential is served from memory while it is valid; it is fetched
+        only when missing, expired or lacking a channel for the camera.
+        """
+        kvs_credential = self._kvs_credential
+        if (
+            kvs_credential is None
+            or device_mac not in kvs_credential.channels
+            or self._kvs_credential_expires_at(kvs_credential) <= datetime.now(UTC)
+        ):
+            kvs_credential = await self._async_refresh_kvs_credential(device_mac)
+        return kvs_credential
+
+    async def _async_refresh_kvs_credential(
+        self, device_mac: str | None = None
+    ) -> KvsCredential:
+        """Fetch the viewer credential of all cameras in one connectAsViewer call."""
+        async with self._kvs_credential_lock:
+            kvs_credential = self._kvs_credential
+            if (
+                kvs_credential is not None
+                and (device_mac is None or device_mac in kvs_credential.channels)
+                and self._kvs_credential_expires_at(kvs_credential)
+                - KVS_CREDENTIAL_REFRESH_MARGIN
+                > datetime.now(UTC)
+            ):
+                # Refreshed by another caller while waiting for the lock
+                return kvs_credential
+
+            device_macs = [
+                device.device_mac
+                for device in self.get_devices_by_type(CAMERA_DEVICE_TYPES)
+            ]
+            if device_mac is not None and device_mac not in device_macs:
+                device_macs.append(device_mac)
+            kvs_credential = await self.api_client.connect_as_viewer(device_macs)
+            self._kvs_credential = kvs_credential
+            # Drop the Kinesis Video clients of the rotated credential
+            self.hass.async_add_executor_job(self.kvs_client_pool.evict, kvs_credential)
+            self._schedule_kvs_credential_refresh(
+                self._kvs_credential_expires_at(kvs_credential)
+                - KVS_CREDENTIAL_REFRESH_MARGIN
+                - datetime.now(UTC)
+            )
+            return kvs_credential
+
+    @callback
+    @callback
+    def _cancel_kvs_credential_refresh(self) -> None:
+        """Cancel the scheduled refresh of the viewer credential."""
+        if self._unsub_kvs_credential_refresh is not None:
+            self._unsub_kvs_credential_refresh()
+            self._unsub_kvs_credential_refresh = None
+
+    def _schedule_kvs_credential_refresh(self, delay: timedelta) -> None:
+        """Schedule the background refresh of the viewer credential."""
+        if self._unsub_kvs_credential_refresh is not None:
+            self._unsub_kvs_credential_refresh()
+        self._unsub_kvs_credential_refresh = async_call_later(
+            self.hass,
+            max(delay, KVS_CREDENTIAL_RETRY_INTERVAL),
+            self._async_kvs_credential_refresh_due,
+        )
+
+    @callback
+    def _async_kvs_credential_refresh_due(self, _now: datetime) -> None:
+        """Start the background refresh of the viewer credential."""
+        self._unsub_kvs_credential_refresh = None
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_scheduled_kvs_credential_refresh(),
+            f"{DOMAIN} kvs credential refresh",
+        )
+
+    async def _async_scheduled_kvs_credential_refresh(self) -> None:
+        """Refresh the viewer credential ahead of its expiry."""
+        try:
+            await self._async_refresh_kvs_credential()
+        except Exception as err:  # noqa: BLE001
+            LOGGER.warning("Failed to refresh kvs credential: %s", err)
+            self._schedule_kvs_credential_refresh(KVS_CREDENTIAL_RETRY_INTERVAL)
+
+    @staticmethod
+    def _kvs_credential_expires_at(kvs_credential: KvsCredential) -> datetime:
+        """Return the expiration of a viewer credential."""
+        return datetime.fromtimestamp(kvs_credential.expiration / 1000, tz=UTC)
@@ -0,0 +1,88 @@
+"""Debug logging helpers for the MQTT and API hot paths."""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any
+
+# Values of keys containing these words are never written to the log
+REDACTED_KEY_PARTS = (
+    "token",
+    "password",
+    "secret",
+    "privatekey",
+    "private_key",
+    "accesskey",
+    "sessionkey",
+)
+REDACTED = "**REDACTED**"
+MAX_DEBUG_BODY_LENGTH = 2000
+
+
+def _is_redacted_key(key: Any) -> bool:
+    if not isinstance(key, str):
+        return False
+    key = key.lower()
+    return any(part in key for part in REDACTED_KEY_PARTS)
+
+
+def redact(body: Any) -> Any:
+    """Return a copy of the body with secret values replaced."""
+    if isinstance(body, dict):
+        return {
+            key: REDACTED if _is_redacted_key(key) else redact(value)
+            for key, value in body.items()
+        }
+    if isinstance(body, list):
+        return [redact(value) for value in body]
+    return body
+
+
+class DebugBody:
+    """Redact and truncate a body only when the log record is formatted."""
+
+    __slots__ = ("body",)
+
+    def __init__(self, body: Any) -> None:
+        """Initialize."""
+        self.body = body
+
+    def __str__(self) -> str:
+        """Return the redacted body as JSON, truncated."""
+        if isinstance(self.body, str):
+            text = self.body
+        else:
+            text = json.dumps(redact(self.body), ensure_ascii=False, default=str)
+        if len(text) > MAX_DEBUG_BODY_LENGTH:
+            return f"{text[:MAX_DEBUG_BODY_LENGTH]}...({len(text)} chars)"
+        return text
+
+
+class DebugSampler:
+    """Log only one out of every sample_rate debug messages of a key.
+
+    The first message of a key is always logged.
+    """
+
+    def __init__(self, logger: logging.Logger, sample_rate: int = 1) -> None:
+        """Initialize."""
+        self._logger = logger
+        self.sample_rate = max(sample_rate, 1)
+        self._counts: dict[str, int] = {}
+
+    def enabled(self, key: str) -> bool:
+        """Return whether a debug message of the key should be logged."""
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return False
+        if self.sample_rate == 1:
+            return True
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        return count % self.sample_rate == 0
+
+
+def log_response(logger: logging.Logger, url: str, resp: Any) -> None:
+    """Log an API response at debug level."""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("URL:%s Response:%s", url, DebugBody(resp))
@@ -0,0 +1,26 @@
+"""Diagnostics support for SwitchBot KVSCamera."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from . import SwitchBotKVSCameraConfigEntry
+from .snapshot_cache import get_snapshot_cache
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: SwitchBotKVSCameraConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = config_entry.runtime_data.coordinator
+    metrics = coordinator.update_notify_metrics
+    return {
+        "mqtt_connected": coordinator.mqtt_client.is_connected(),
+        "cameras": len(coordinator.mqtt_kvs_cams),
+        "update_notifications": {**asdict(metrics), "merged": metrics.merged},
+        "command_latency": coordinator.command_tracker.as_dict(),
+        "snapshot_cache": get_snapshot_cache(hass).as_dict(),
+    }
@@ -0,0 +1 @@
+"""switchbot_camera kvs client."""
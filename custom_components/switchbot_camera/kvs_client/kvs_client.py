@@ -0,0 +1,102 @@
+"""Kinesis Video client pool."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+import functools
+import logging
+import threading
+
+import boto3
+from botocore.client import BaseClient
+
+from ..api_client.model.kvs_credential import KvsCredential  # noqa: TID252
+
+LOGGER = logging.getLogger(__package__)
+
+
+@dataclass(frozen=True, slots=True)
+class SignalingChannel:
+    """Signaling channel ARN and endpoints, which rarely change."""
+
+    channel_name: str
+    channel_arn: str
+    endpoints_by_protocol: dict[str, str]
+    expires_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class IceServerConfig:
+    """ICE servers, valid for the TTL of their TURN credentials."""
+
+    ice_servers: list[dict[str, str]]
+    expires_at: datetime
+
+
+# boto3 sessions are not thread safe, and the session is shared by the pools of
+# all config entries, so clients are created under this lock
+_boto3_session_lock = threading.Lock()
+
+
+@functools.cache
+def _get_boto3_session() -> boto3.session.Session:
+    """Return the process wide boto3 session.
+
+    The session owns the botocore loader, so the service models are read from
+    disk once per process instead of once per client.
+    """
+    return boto3.session.Session()
+
+
+class KinesisVideoClientPool:
+    """Pool of Kinesis Video clients.
+
+    Clients are keyed by service, region, credential generation and endpoint.
+    The generation is the access key id of the viewer credential, so clients
+    of a rotated credential are never reused.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._clients: dict[tuple[str, str, str, str | None], BaseClient] = {}
+
+    def get_client(
+        self,
+        service_name: str,
+        region: str,
+        kvs_credential: KvsCredential,
+        endpoint_url: str | None = None,
+    ) -> BaseClient:
+        """Return a pooled client, creating it if needed.
+
+        This is blocking and must be run in the executor.
+        """
+        key = (service_name, region, kvs_credential.access, endpoint_url)
+        with _boto3_session_lock:
+            if (client := self._clients.get(key)) is None:
+                LOGGER.debug("Create %s client for %s", service_name, region)
+                client = _get_boto3_session().client(
+                    service_name,
+                    region_name=region,
+                    aws_access_key_id=kvs_credential.access,
+                    aws_secret_access_key=kvs_credential.secret,
+                    aws_session_token=kvs_credential.token,
+                    endpoint_url=endpoint_url,
+                )
+                self._clients[key] = client
+            return client
+
+    def evict(self, kvs_credential: KvsCredential | None = None) -> None:
+        """Close the clients that do not belong to the given credential.
+
+        Without a credential every client is closed.
+        """
+        with _boto3_session_lock:
+            stale_keys = [
+                key
+                for key in self._clients
+                if kvs_credential is None or key[2] != kvs_credential.access
+            ]
+            for key in stale_keys:
+                self._clients.pop(key).close()
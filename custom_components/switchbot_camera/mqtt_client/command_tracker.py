@@ -0,0 +1,141 @@
+"""Correlate camera commands with their acks."""
+
+import asyncio
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import Any
+
+LOGGER = logging.getLogger(__package__)
+
+COMMAND_ACK_TIMEOUT_SECONDS = 10
+# Upper bounds of the latency histogram buckets, the last bucket is unbounded
+LATENCY_BUCKETS_SECONDS = (0.25, 0.5, 1, 2, 5, 10)
+
+
+@dataclass
+class LatencyHistogram:
+    """Round-trip latency of a command type."""
+
+    counts: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS_SECONDS) + 1)
+    )
+    acked: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    total_seconds: float = 0
+    max_seconds: float = 0
+
+    def record(self, seconds: float) -> None:
+        """Record the latency of an ack."""
+        self.counts[bisect_left(LATENCY_BUCKETS_SECONDS, seconds)] += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return as a dict."""
+        answered = self.acked + self.failed
+        return {
+            "buckets": {
+                **{
+                    f"<={bound}s": count
+                    for bound, count in zip(
+                        LATENCY_BUCKETS_SECONDS, self.counts, strict=False
+                    )
+                },
+                f">{LATENCY_BUCKETS_SECONDS[-1]}s": self.counts[-1],
+            },
+            "acked": self.acked,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "average_seconds": self.total_seconds / answered if answered else None,
+            "max_seconds": self.max_seconds,
+        }
+
+
+@dataclass
+class _PendingCommand:
+    sent_at: float
+    future: asyncio.Future[bool]
+    timeout_handle: asyncio.TimerHandle | None = None
+
+
+class CommandTracker:
+    """Keep the commands sent to the cameras until they are acked.
+
+    The cameras do not echo an id, so an ack resolves the oldest pending
+    command of the same type on the same camera. Must be used on the event loop.
+    """
+
+    def __init__(self, timeout: float = COMMAND_ACK_TIMEOUT_SECONDS) -> None:
+        """Initialize."""
+        self.timeout = timeout
+        self._pending: dict[tuple[str, str], deque[_PendingCommand]] = {}
+        self.latencies: dict[str, LatencyHistogram] = {}
+
+    def track(self, device_mac: str, command_type: str) -> asyncio.Future[bool]:
+        """Return a future resolved with whether the command was acked.
+
+        It resolves to False when the camera rejects the command or does not
+        answer within the timeout.
+        """
+        loop = asyncio.get_running_loop()
+        key = (device_mac, command_type)
+        command = _PendingCommand(time.monotonic(), loop.create_future())
+        command.timeout_handle = loop.call_later(
+            self.timeout, self._timeout, key, command
+        )
+        self._pending.setdefault(key, deque()).append(command)
+        return command.future
+
+    def resolve(self, device_mac: str, command_type: str, acked: bool) -> None:
+        """Resolve the oldest pending command of a type with its ack."""
+        key = (device_mac, command_type)
+        if not (pending := self._pending.get(key)):
+            return
+        command = pending.popleft()
+        if not pending:
+            del self._pending[key]
+        command.timeout_handle.cancel()
+        latency = self._histogram(command_type)
+        latency.record(time.monotonic() - command.sent_at)
+        if acked:
+            latency.acked += 1
+        else:
+            latency.failed += 1
+        if not command.future.done():
+            command.future.set_result(acked)
+
+    def _timeout(self, key: tuple[str, str], command: _PendingCommand) -> None:
+        pending = self._pending.get(key)
+        if pending is None or command not in pending:
+            return
+        pending.remove(command)
+        if not pending:
+            del self._pending[key]
+        LOGGER.debug("Command %s of %s was not acked", key[1], key[0])
+        self._histogram(key[1]).timed_out += 1
+        if not command.future.done():
+            command.future.set_result(False)
+
+    def _histogram(self, command_type: str) -> LatencyHistogram:
+        if (latency := self.latencies.get(command_type)) is None:
+            latency = self.latencies[command_type] = LatencyHistogram()
+        return latency
+
+    def cancel_all(self) -> None:
+        """Cancel all pending commands."""
+        for pending in self._pending.values():
+            for command in pending:
+                command.timeout_handle.cancel()
+                command.future.cancel()
+        self._pending = {}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the latencies per command type."""
+        return {
+            command_type: latency.as_dict()
+            for command_type, latency in self.latencies.items()
+        }
@@ -1,27 +1,60 @@
 """MqttClient class."""
 
+import asyncio
 import base64
 from collections.abc import Callable
 import gzip
 import json
 import logging
 from pathlib import Path
+import socket
 import ssl
 from tempfile import TemporaryDirectory
-import threading
-import time
+from typing import Any
 from urllib.parse import urlsplit
 
 from paho.mqtt import client as paho_mqtt_client
 from paho.mqtt.client import MQTTMessage as paho_mqtt_message
 
+from ..debug_log import DebugBody, DebugSampler  # noqa: TID252
+
 LOGGER = logging.getLogger(__package__)
 
 CONNECT_FAILED_NOT_AUTHORISED = 5
 
+# The broker requires a reconnect every 2 hours
+RECONNECT_INTERVAL_SECONDS = 60 * 60 * 2 - 60
+MAX_RECONNECT_BACKOFF_SECONDS = 60
+# The reconnect backoff is reset once a connection stayed up that long
+STABLE_CONNECTION_SECONDS = 60
+MISC_LOOP_INTERVAL_SECONDS = 1
+MAX_PACKETS_TO_READ = 500
+
+# Payloads made only of these bytes are passed on as text
+TEXT_PAYLOAD_CHARS = (
+    b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz -_|;:"
+)
+
+# A decoded payload: the parsed object for JSON, otherwise the text
+MqttPayload = dict[str, Any] | list[Any] | str
+MqttListener = Callable[[str, MqttPayload], None]
+
+
+def _decompress_messages(payload: MqttPayload) -> None:
+    """Decode the gzip compressed messages field in place."""
+    if isinstance(payload, dict) and isinstance(payload.get("messages"), str):
+        payload["messages"] = json.loads(
+            gzip.decompress(base64.b64decode(payload["messages"]))
+        )
+
+
+class SwitchBotMqttClient:
+    """MqttClient class.
 
-class SwitchBotMqttClient(threading.Thread):
-    """MqttClient class."""
+    The paho client is driven from the asyncio event loop: its socket is
+    watched with add_reader/add_writer and loop_misc runs on a timer, so no
+    thread is started and every callback runs on the event loop.
+    """
 
     def __init__(
         self,
@@ -30,10 +63,15 @@ class SwitchBotMqttClient(threading.Thread):
         mqtt_self_signed_cert_public_key_pem: str,
         mqtt_self_signed_cert_private_key_pem: str,
         subscribe_topics: list[str] | None = None,
+        on_connection_change: Callable[[bool], None] | None = None,
+        debug_sample_rate: int = 1,
     ) -> None:
-        """Initialize."""
-        super().__init__()
-        self._stop_event = threading.Event()
+        """Initialize.
+
+        on_connection_change is called on the event loop when the connection to
+        the broker is established or lost. debug_sample_rate limits the debug
+        log of received messages to one out of every n messages per topic.
+        """
         self.device_id = device_id
         self.mqtt_self_signed_endpoint = mqtt_self_signed_endpoint
         self.mqtt_self_signed_cert_public_key_pem = mqtt_self_signed_cert_public_key_pem
@@ -45,17 +83,37 @@ class SwitchBotMqttClient(threading.Thread):
             self._subscribe_topics = subscribe_topics
         else:
             self._subscribe_topics = []
-        self.message_listeners = set()
-        self.allow_chars = bytes(
-            "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz -_|;:",
-            "utf-8",
-        )
+        # Listeners indexed by the topic they were subscribed with
+        self._topic_listeners: dict[str, set[MqttListener]] = {}
+        self._wildcard_listeners: dict[str, set[MqttListener]] = {}
+        self.on_connection_change = on_connection_change
+        self._debug_sampler = DebugSampler(LOGGER, debug_sample_rate)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._connected = asyncio.Event()
+        self._stopped = False
+        self._backoff_seconds = 1
+        self._connected_at: float | None = None
+        self._connect_task: asyncio.Task | None = None
+        self._reconnect_handle: asyncio.TimerHandle | None = None
+        self._misc_handle: asyncio.TimerHandle | None = None
+        self._socket_filenos: dict[paho_mqtt_client.Client, int] = {}
 
     def _on_disconnect(self, client, userdata, rc):
         if rc != 0:
             LOGGER.error("Unexpected disconnection. %s", rc)
         else:
             LOGGER.debug("disconnect")
+        if client is self._mqtt_client:
+            self._async_set_connected(False)
+            connected_at, self._connected_at = self._connected_at, None
+            if rc != 0:
+                if (
+                    connected_at is not None
+                    and self._loop.time() - connected_at >= STABLE_CONNECTION_SECONDS
+                ):
+                    self._backoff_seconds = 1
+                # A flapping broker is retried less and less often
+                self._async_schedule_reconnect()
 
     def _on_connect(
         self, mqtt_client: paho_mqtt_client.Client, user_data: any, flags, rc
@@ -64,9 +122,22 @@ class SwitchBotMqttClient(threading.Thread):
         if rc == 0:
             for topic in self._subscribe_topics:
                 mqtt_client.subscribe(topic)
+            self._connected_at = self._loop.time()
+            self._async_set_connected(True)
 
         elif rc == CONNECT_FAILED_NOT_AUTHORISED:
-            self.__run_mqtt()
+            self._async_schedule_connect(0)
+
+    def _async_set_connected(self, connected: bool) -> None:
+        """Update the connection state on the event loop."""
+        if connected == self._connected.is_set():
+            return
+        if connected:
+            self._connected.set()
+        else:
+            self._connected.clear()
+        if self.on_connection_change is not None:
+            self.on_connection_change(connected)
 
     def _on_message(
         self,
@@ -74,38 +145,42 @@ class SwitchBotMqttClient(threading.Thread):
         user_data: any,
         msg: paho_mqtt_message,
     ):
+        listeners = self._listeners_for(msg.topic)
+        log_message = self._debug_sampler.enabled(msg.topic)
+        if not listeners and not log_message:
+            # Nobody would see the payload, skip decoding it
+            return
         try:
-            processed_payload = self.process_common_payload(msg.payload)
-            if msg.topic.startswith("v1_1/") and msg.topic.endswith(
-                "/all/notifyAllProperty"
+            # The payload is parsed once and the decoded object is shared by
+            # all listeners, which must not modify it.
+            payload = self.process_common_payload(msg.payload)
+            if (
+                msg.topic.startswith("v1_1/")
+                and msg.topic.endswith("/all/notifyAllProperty")
+            ) or (
+                msg.topic.startswith("switchlink/")
+                and msg.topic.endswith("/link_to_device_status")
             ):
                 # v1_1/{user_id}/all/notifyAllProperty
-                temp = json.loads(processed_payload)
-                temp["messages"] = json.loads(
-                    gzip.decompress(base64.b64decode(temp["messages"])).decode("utf-8")
-                )
-                processed_payload = json.dumps(temp, ensure_ascii=False)
-
-            if msg.topic.startswith("switchlink/") and msg.topic.endswith(
-                "/link_to_device_status"
-            ):
                 # switchlink/{user_id}/link_to_device_status
-                temp = json.loads(processed_payload)
-                if isinstance(temp["messages"], str):
-                    temp["messages"] = json.loads(
-                        gzip.decompress(base64.b64decode(temp["messages"])).decode(
-                            "utf-8"
-                        )
-                    )
-                    processed_payload = json.dumps(temp, ensure_ascii=False)
-            LOGGER.debug("on_message: %s %s", msg.topic, processed_payload)
-
-            for listener in self.message_listeners:
-                listener(msg.topic, processed_payload)
+                _decompress_messages(payload)
+            if log_message:
+                LOGGER.debug("on_message: %s %s", msg.topic, DebugBody(payload))
+
+            for listener in listeners:
+                listener(msg.topic, payload)
         except Exception as ex:  # noqa: BLE001
             LOGGER.error("Error processing message: %s", ex)
             LOGGER.debug("Error processing message: %s", ex, exc_info=True)
 
+    def _listeners_for(self, topic: str) -> list[MqttListener]:
+        """Return the listeners subscribed to a topic."""
+        listeners = list(self._topic_listeners.get(topic, ()))
+        for subscription, wildcard_listeners in self._wildcard_listeners.items():
+            if paho_mqtt_client.topic_matches_sub(subscription, topic):
+                listeners.extend(wildcard_listeners)
+        return listeners
+
     def _on_subscribe(
         self, mqtt_client: paho_mqtt_client.Client, user_data: any, mid, granted_qos
     ):
@@ -116,37 +191,129 @@ class SwitchBotMqttClient(threading.Thread):
     ):
         LOGGER.debug("_on_log: %s", string)
 
-    def run(self):
-        """Run mqtt client."""
-        backoff_seconds = 1
-        while not self._stop_event.is_set():
-            try:
-                self.__run_mqtt()
-                backoff_seconds = 1
-
-                # reconnect every 2 hours required.
-                if self._stop_event.wait(60 * 60 * 2 - 60):
-                    break
-            except Exception:
-                LOGGER.exception("Failed to refresh mqtt server")
-                LOGGER.error(
-                    "Failed to refresh mqtt server, retrying in %s seconds",
-                    backoff_seconds,
-                )
+    def _on_socket_open(
+        self, mqtt_client: paho_mqtt_client.Client, user_data: any, sock: socket
+    ):
+        # Called from the executor while connecting
+        self._loop.call_soon_threadsafe(self._async_on_socket_open, mqtt_client, sock)
+
+    def _async_on_socket_open(self, mqtt_client: paho_mqtt_client.Client, sock):
+        fileno = sock.fileno()
+        if fileno < 0:
+            return
+        self._socket_filenos[mqtt_client] = fileno
+        self._loop.add_reader(fileno, self._async_reader_callback, mqtt_client)
+        if self._misc_handle is None:
+            self._misc_handle = self._loop.call_later(
+                MISC_LOOP_INTERVAL_SECONDS, self._async_misc_loop
+            )
+
+    def _on_socket_close(
+        self, mqtt_client: paho_mqtt_client.Client, user_data: any, sock: socket
+    ):
+        # Unregister right away on the event loop, before the fd can be reused
+        # by another socket. Only a connect failing in the executor defers it,
+        # after the deferred registration of the socket.
+        if self._is_on_event_loop():
+            self._async_on_socket_close(mqtt_client)
+        else:
+            self._loop.call_soon_threadsafe(self._async_on_socket_close, mqtt_client)
 
-                time.sleep(backoff_seconds)
-                backoff_seconds = min(
-                    backoff_seconds * 2, 60
-                )  # Try at most every 60 seconds to refresh
-        LOGGER.debug("run complete")
+    def _async_on_socket_close(self, mqtt_client: paho_mqtt_client.Client):
+        if (fileno := self._socket_filenos.pop(mqtt_client, None)) is not None:
+            self._loop.remove_reader(fileno)
+            self._loop.remove_writer(fileno)
 
-    def __run_mqtt(self):
-        LOGGER.debug("connecting")
-        new_mqtt_client = self._start()
+    def _is_on_event_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    # The write callbacks also go through call_soon_threadsafe, even on the
+    # event loop, so that register and unregister are applied in order.
+    def _on_socket_register_write(
+        self, mqtt_client: paho_mqtt_client.Client, user_data: any, sock: socket
+    ):
+        self._loop.call_soon_threadsafe(
+            self._async_on_socket_register_write, mqtt_client
+        )
+
+    def _async_on_socket_register_write(self, mqtt_client: paho_mqtt_client.Client):
+        if (fileno := self._socket_filenos.get(mqtt_client)) is not None:
+            self._loop.add_writer(fileno, mqtt_client.loop_write)
 
-        if self._mqtt_client:
-            self._mqtt_client.disconnect()
+    def _on_socket_unregister_write(
+        self, mqtt_client: paho_mqtt_client.Client, user_data: any, sock: socket
+    ):
+        self._loop.call_soon_threadsafe(
+            self._async_on_socket_unregister_write, mqtt_client
+        )
+
+    def _async_on_socket_unregister_write(self, mqtt_client: paho_mqtt_client.Client):
+        if (fileno := self._socket_filenos.get(mqtt_client)) is not None:
+            self._loop.remove_writer(fileno)
+
+    def _async_reader_callback(self, mqtt_client: paho_mqtt_client.Client):
+        mqtt_client.loop_read(MAX_PACKETS_TO_READ)
+
+    def _async_misc_loop(self):
+        self._misc_handle = None
+        if not self._socket_filenos:
+            return
+        for mqtt_client in list(self._socket_filenos):
+            mqtt_client.loop_misc()
+        self._misc_handle = self._loop.call_later(
+            MISC_LOOP_INTERVAL_SECONDS, self._async_misc_loop
+        )
+
+    def _async_schedule_connect(self, delay: float):
+        if self._stopped:
+            return
+        if self._reconnect_handle is not None:
+            self._reconnect_handle.cancel()
+        self._reconnect_handle = self._loop.call_later(delay, self._async_connect)
+
+    def _async_schedule_reconnect(self):
+        """Reconnect after the backoff, which doubles up to its maximum."""
+        self._async_schedule_connect(self._backoff_seconds)
+        self._backoff_seconds = min(
+            self._backoff_seconds * 2, MAX_RECONNECT_BACKOFF_SECONDS
+        )
+
+    def _async_connect(self):
+        self._reconnect_handle = None
+        if self._stopped or (
+            self._connect_task is not None and not self._connect_task.done()
+        ):
+            return
+        self._connect_task = self._loop.create_task(self.__async_run_mqtt())
+
+    async def __async_run_mqtt(self):
+        LOGGER.debug("connecting")
+        try:
+            new_mqtt_client = await self._loop.run_in_executor(None, self._start)
+        except Exception:
+            LOGGER.exception("Failed to refresh mqtt server")
+            LOGGER.error(
+                "Failed to refresh mqtt server, retrying in %s seconds",
+                self._backoff_seconds,
+            )
+            # Try at most every 60 seconds to refresh
+            self._async_schedule_reconnect()
+            return
+        if self._stopped:
+            # Stopped while connecting, the client was not handed over
+            new_mqtt_client.disconnect()
+            return
+
+        old_mqtt_client = self._mqtt_client
         self._mqtt_client = new_mqtt_client
+        if old_mqtt_client:
+            old_mqtt_client.disconnect()
+
+        # reconnect every 2 hours required.
+        self._async_schedule_connect(RECONNECT_INTERVAL_SECONDS)
 
     def _start(self) -> paho_mqtt_client.Client:
         client = paho_mqtt_client.Client(client_id=self.device_id)
@@ -172,35 +339,50 @@ class SwitchBotMqttClient(threading.Thread):
         client.on_message = self._on_message
         client.on_subscribe = self._on_subscribe
         client.on_log = self._on_log
+        client.on_socket_open = self._on_socket_open
+        client.on_socket_close = self._on_socket_close
+        client.on_socket_register_write = self._on_socket_register_write
+        client.on_socket_unregister_write = self._on_socket_unregister_write
 
         client.tls_set_context(ssl_context)
         url = urlsplit(self.mqtt_self_signed_endpoint)
         client.connect(url.hostname, url.port)
 
-        client.loop_start()
         return client
 
     def start(self):
         """Start mqtt.
 
-        Start mqtt thread
+        Connect in the background, must be called from the event loop.
         """
         LOGGER.debug("start")
-        super().start()
+        self._loop = asyncio.get_running_loop()
+        self._async_connect()
 
     def stop(self):
         """Stop mqtt.
 
-        Stop mqtt thread
+        Must be called from the event loop.
         """
         LOGGER.debug("stop")
-        self.message_listeners = set()
+        self._stopped = True
+        self._topic_listeners = {}
+        self._wildcard_listeners = {}
+        for handle in (self._reconnect_handle, self._misc_handle):
+            if handle is not None:
+                handle.cancel()
+        self._reconnect_handle = None
+        self._misc_handle = None
+        # A connect in progress is not cancelled: the executor would keep
+        # running and leave its client connected. It disconnects the client
+        # itself once it sees _stopped.
+        self._connect_task = None
         try:
-            self._mqtt_client.disconnect()
+            if self._mqtt_client is not None:
+                self._mqtt_client.disconnect()
         except Exception:
             LOGGER.exception("Mqtt disconnect error")
         self._mqtt_client = None
-        self._stop_event.set()
 
     def is_connected(self) -> bool:
         """Check if mqtt is connected."""
@@ -208,40 +390,80 @@ class SwitchBotMqttClient(threading.Thread):
             return False
         return self._mqtt_client.is_connected()
 
-    def subscribe(self, topic: str, listener: Callable[[str, str], None]):
-        """Subscribe to a topic."""
+    async def async_wait_connected(self) -> None:
+        """Wait until the broker has accepted the connection."""
+        await self._connected.wait()
+
+    def subscribe(self, topic: str, listener: MqttListener):
+        """Subscribe to a topic.
+
+        The listener only receives the messages of the topic, which may contain
+        the + and # wildcards. While disconnected the topic is subscribed once
+        the connection is made.
+        """
 
         if topic not in self._subscribe_topics:
             self._subscribe_topics.append(topic)
-            self._mqtt_client.subscribe(topic)
-        self.message_listeners.add(listener)
+            if self.is_connected():
+                self._mqtt_client.subscribe(topic)
+        self.__listeners_index(topic).setdefault(topic, set()).add(listener)
+
+    def unsubscribe(self, topic: str, listener: MqttListener):
+        """Unsubscribe from a topic.
 
-    def unsubscribe(self, topic: str, listener: Callable[[str, str], None]):
-        """Unsubscribe from a topic."""
+        The topic is unsubscribed when its last listener is removed.
+        """
+        index = self.__listeners_index(topic)
+        if (listeners := index.get(topic)) is not None:
+            listeners.discard(listener)
+            if listeners:
+                return
+            del index[topic]
         if topic in self._subscribe_topics:
             self._subscribe_topics.remove(topic)
-            self._mqtt_client.unsubscribe(topic)
-        self.message_listeners.discard(listener)
+            if self.is_connected():
+                self._mqtt_client.unsubscribe(topic)
+
+    def __listeners_index(self, topic: str) -> dict[str, set[MqttListener]]:
+        if "+" in topic or "#" in topic:
+            return self._wildcard_listeners
+        return self._topic_listeners
 
     def publish(self, topic: str, payload: str):
-        """Publish to a topic."""
+        """Publish to a topic.
+
+        Safe to call from any thread, the packet is queued on the event loop.
+        """
+        self._loop.call_soon_threadsafe(self._async_publish, topic, payload)
+
+    def _async_publish(self, topic: str, payload: str):
+        if not self.is_connected():
+            LOGGER.debug("Not connected, drop publish to %s", topic)
+            return
         self._mqtt_client.publish(topic, payload)
 
-    def process_common_payload(self, payload: bytes) -> str:
-        """Process payload."""
+    def process_common_payload(self, payload: bytes) -> MqttPayload:
+        """Process payload.
+
+        JSON is returned decoded, anything else as text.
+        """
         if len(payload) == 0:
             return ""
 
         if len(payload) > 1 and payload[0] == ord("{") and payload[-1] == ord("}"):
             # json
-            json_object = json.loads(bytes(payload).decode("utf-8"))
-            return json.dumps(json_object, ensure_ascii=False)
+            return json.loads(payload)
 
-        if all(b in self.allow_chars for b in payload):
-            return bytes(payload).decode("utf-8")
+        # translate deletes the text bytes in C, anything left over is binary
+        if not payload.translate(None, TEXT_PAYLOAD_CHARS):
+            return payload.decode("utf-8")
 
-        try:
-            index = payload.index(ord(" "), payload.index(ord(" ")) + 1)
-            return f"{bytes(payload[:index]).decode('utf-8')} HEX({bytes(payload[index:]).hex().upper()})"
-        except ValueError:
-            return f"HEX({bytes(payload).hex().upper()})"
+        # Binary: keep the text up to the second space, hex dump the rest
+        view = memoryview(payload)
+        index = payload.find(b" ", payload.find(b" ") + 1)
+        if index > 0:
+            try:
+                return f"{str(view[:index], 'utf-8')} HEX({view[index:].hex().upper()})"
+            except UnicodeDecodeError:
+                pass
+        return f"HEX({view.hex().upper()})"
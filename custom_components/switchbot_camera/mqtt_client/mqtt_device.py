@@ -3,7 +3,8 @@
 import logging
 
 from ..api_client.model.devices import Device  # noqa: TID252
-from .mqtt_client import SwitchBotMqttClient
+from ..debug_log import DebugBody  # noqa: TID252
+from .mqtt_client import MqttPayload, SwitchBotMqttClient
 
 LOGGER = logging.getLogger(__package__)
 
@@ -28,7 +29,7 @@ class MqttDevice:
             "no_pubtopic",
         ]:
             self._mqtt_client.subscribe(
-                self.device.device_detail.subtopic,
+                self.device.device_detail.pubtopic,
                 self.on_message,
             )
         if self.device.device_detail.subtopic not in [
@@ -42,16 +43,13 @@ class MqttDevice:
                 self.on_message,
             )
 
-    def on_message(self, topic: str, payload: str) -> None:
-        """Handle incoming messages."""
-        if topic in (
-            self.device.device_detail.subtopic,
-            self.device.device_detail.pubtopic,
-        ):
+    def on_message(self, topic: str, payload: MqttPayload) -> None:
+        """Handle incoming messages of the device topics."""
+        if LOGGER.isEnabledFor(logging.DEBUG):
             LOGGER.debug(
                 "MqttDevice %s %s receive-> %s,%s",
                 self.device.device_mac,
                 self.device.device_detail.device_type,
                 topic,
-                payload,
+                DebugBody(payload),
             )
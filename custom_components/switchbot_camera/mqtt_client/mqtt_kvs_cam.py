@@ -1,101 +1,155 @@
 """SwitchBot KVS Camera MQTT Client."""
 
+import asyncio
 from collections.abc import Callable
+from dataclasses import dataclass, field
 from enum import IntEnum, StrEnum, auto
 import json
 import logging
 import time
+from typing import Any, TypeVar
 
 from ..api_client.model.devices import Device  # noqa: TID252
-from .mqtt_client import SwitchBotMqttClient
+from ..api_client.model.parser import from_dict  # noqa: TID252
+from ..debug_log import DebugBody  # noqa: TID252
+from .command_tracker import CommandTracker
+from .mqtt_client import MqttPayload, SwitchBotMqttClient
 from .mqtt_device import MqttDevice
 
 LOGGER = logging.getLogger(__package__)
 
-
+_ModelT = TypeVar("_ModelT")
+
+# Commands the cameras ack on the kvsBackToApp topic
+ACKED_COMMAND_TYPES = frozenset(
+    {
+        # button
+        "autoUpgrade",
+        "setCruiseOpen",
+        "setPrivacy",
+        "setDarkFullColor",
+        "setFlipView",
+        "setHumanFilter",
+        "setIndicatorLight",
+        "isOpenMobileTracking",
+        "setMoveDetect",
+        "setSdCardStorage",
+        "setTimeWatermark",
+        "setSensitive",
+        "muteRecord",
+        "createPreset",
+        "rtspEnable",
+        # select
+        "setAntiFlicker",
+        "setNightVision",
+        "setIntercomWay",
+        "triggerPreset",
+        # number
+        "setVolumeLevel",
+    }
+)
+# Some acks are named differently from their command
+ACK_COMMAND_TYPES = {
+    "set_night_vision": "setNightVision",
+    "set_intercom_way": "setIntercomWay",
+    "set_sensitive_level": "setSensitive",
+}
+
+
+# Only the message type is required, the firmware versions do not all send the
+# same fields and a missing one leaves the entities reading it unknown. Unknown
+# keys sent by newer firmware are ignored. The timestamp changes on every push,
+# it is left out of the comparison so unchanged pushes are ignored.
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
 class Detectalarm:
     """Detect Alarm."""
 
-    duration: int
-    volume: int
-    tone: int
-    open: bool
+    duration: int | None = None
+    volume: int | None = None
+    tone: int | None = None
+    open: bool | None = None
 
 
+@dataclass(frozen=True, slots=True, kw_only=True)
 class Rtsp:
     """Rstp."""
 
-    open: bool
-    password: str
-    rtspMainUrl: str  # noqa: N815
-    rtspSubUrl: str  # noqa: N815
-    userName: str  # noqa: N815
+    open: bool | None = None
+    password: str | None = None
+    rtspMainUrl: str | None = None  # noqa: N815
+    rtspSubUrl: str | None = None  # noqa: N815
+    userName: str | None = None  # noqa: N815
 
 
+@dataclass(frozen=True, slots=True, kw_only=True)
 class KvsStatus:
     """Status."""
 
-    antiFlicker: str  # noqa: N815
-    autoUpgrade: bool  # noqa: N815
-    cpu_version: str
-    detectAlarm: Detectalarm  # noqa: N815
-    doubleSpeedRatio: str  # noqa: N815
-    doubleSpeedType: str  # noqa: N815
-    hardware_version: int
-    ipAddress: str  # noqa: N815
-    isCruiseOpen: bool  # noqa: N815
-    isHaveSdCard: bool  # noqa: N815
-    isInPrivateMode: bool  # noqa: N815
-    isOpenArea: bool  # noqa: N815
-    isOpenDarkFullColor: bool  # noqa: N815
-    isOpenFlipScreen: bool  # noqa: N815
-    isOpenHumamFilter: bool  # noqa: N815
-    isOpenIndicatorLight: bool  # noqa: N815
-    isOpenMobileTracking: bool  # noqa: N815
-    isOpenMotionDetection: bool  # noqa: N815
-    isOpenNightVision: str  # noqa: N815
-    isOpenRecord: bool  # noqa: N815
-    isOpenSingleIntercom: str  # noqa: N815
-    isOpenTimeWatermark: bool  # noqa: N815
-    mcu_version: str
-    muteRecord: bool  # noqa: N815
-    recordMode: int  # noqa: N815
-    reslution: str
-    rtsp: Rtsp
-    sdcardFormateTime: int  # noqa: N815
-    sdcardStatus: int  # noqa: N815
-    sensitivityLevel: str  # noqa: N815
-    setK20Bind: int  # noqa: N815
-    soundAlarm: bool  # noqa: N815
-    timeZoneID: str  # noqa: N815
-    timeZonePosix: str  # noqa: N815
-    timestamp: int
+    antiFlicker: str | None = None  # noqa: N815
+    autoUpgrade: bool | None = None  # noqa: N815
+    cpu_version: str | None = None
+    detectAlarm: Detectalarm | None = None  # noqa: N815
+    doubleSpeedRatio: str | None = None  # noqa: N815
+    doubleSpeedType: str | None = None  # noqa: N815
+    hardware_version: int | None = None
+    ipAddress: str | None = None  # noqa: N815
+    isCruiseOpen: bool | None = None  # noqa: N815
+    isHaveSdCard: bool | None = None  # noqa: N815
+    isInPrivateMode: bool | None = None  # noqa: N815
+    isOpenArea: bool | None = None  # noqa: N815
+    isOpenDarkFullColor: bool | None = None  # noqa: N815
+    isOpenFlipScreen: bool | None = None  # noqa: N815
+    isOpenHumamFilter: bool | None = None  # noqa: N815
+    isOpenIndicatorLight: bool | None = None  # noqa: N815
+    isOpenMobileTracking: bool | None = None  # noqa: N815
+    isOpenMotionDetection: bool | None = None  # noqa: N815
+    isOpenNightVision: str | None = None  # noqa: N815
+    isOpenRecord: bool | None = None  # noqa: N815
+    isOpenSingleIntercom: str | None = None  # noqa: N815
+    isOpenTimeWatermark: bool | None = None  # noqa: N815
+    mcu_version: str | None = None
+    muteRecord: bool | None = None  # noqa: N815
+    recordMode: int | None = None  # noqa: N815
+    reslution: str | None = None
+    rtsp: Rtsp | None = None
+    sdcardFormateTime: int | None = None  # noqa: N815
+    sdcardStatus: int | None = None  # noqa: N815
+    sensitivityLevel: str | None = None  # noqa: N815
+    setK20Bind: int | None = None  # noqa: N815
+    soundAlarm: bool | None = None  # noqa: N815
+    timeZoneID: str | None = None  # noqa: N815
+    timeZonePosix: str | None = None  # noqa: N815
+    timestamp: int | None = field(default=None, compare=False)
     type: str
-    volumeLevel: str  # noqa: N815
-    wifiSignal: str  # noqa: N815
+    volumeLevel: str | None = None  # noqa: N815
+    wifiSignal: str | None = None  # noqa: N815
 
 
+@dataclass(frozen=True, slots=True, kw_only=True)
 class SdCardCapacity:
     """SdCardCapacity."""
 
-    free: float
-    isOpenRecord: bool  # noqa: N815
-    muteRecord: bool  # noqa: N815
-    recordMode: int  # noqa: N815
-    timestamp: int
-    total: float
+    free: float | None = None
+    isOpenRecord: bool | None = None  # noqa: N815
+    muteRecord: bool | None = None  # noqa: N815
+    recordMode: int | None = None  # noqa: N815
+    timestamp: int | None = field(default=None, compare=False)
+    total: float | None = None
     type: str
-    used: float
+    used: float | None = None
 
 
+@dataclass(frozen=True, slots=True, kw_only=True)
 class WiFiInfo:
     """WiFiInfo."""
 
-    ipAddress: str  # noqa: N815
-    timestamp: int
+    ipAddress: str | None = None  # noqa: N815
+    timestamp: int | None = field(default=None, compare=False)
     type: str
-    wifiName: str  # noqa: N815
-    wifiSignal: str  # noqa: N815
+    wifiName: str | None = None  # noqa: N815
+    wifiSignal: str | None = None  # noqa: N815
 
 
 class MotorDirection(StrEnum):
@@ -177,11 +231,15 @@ class SwitchBotMqttKVSCam(MqttDevice):
         device: Device,
         identifier: str,
         update_kvs_status: Callable[[str, KvsStatus], None],
-        update_sd_card_capacity: Callable[[str, KvsStatus], None],
-        update_wifi_info: Callable[[str, KvsStatus], None],
+        update_sd_card_capacity: Callable[[str, SdCardCapacity], None],
+        update_wifi_info: Callable[[str, WiFiInfo], None],
         complete_create_preset: Callable[[str, str], None],
+        command_tracker: CommandTracker | None = None,
     ) -> None:
-        """Initialize."""
+        """Initialize.
+
+        Acked commands are tracked by command_tracker when given.
+        """
         super().__init__(mqtt_client, device)
         self.control_topic = f"$aws/rules/kvs_user_message_route_rule/switchlink/{device.userID}/{device.device_mac}/{device.device_detail.device_type}/appToKvsBack"
         self.identifier = identifier
@@ -195,65 +253,67 @@ class SwitchBotMqttKVSCam(MqttDevice):
         self.update_sd_card_capacity = update_sd_card_capacity
         self.update_wifi_info = update_wifi_info
         self.complete_create_preset = complete_create_preset
+        self.command_tracker = command_tracker
 
-    def on_kvs_back_to_app(self, topic: str, payload_str: str) -> None:
-        """Handle incoming messages."""
-        if topic == self.kvs_back_to_app_topic:
+    def on_kvs_back_to_app(self, topic: str, payload: MqttPayload) -> None:
+        """Handle incoming messages of the kvsBackToApp topic."""
+        if LOGGER.isEnabledFor(logging.DEBUG):
             LOGGER.debug(
                 "SwitchBotMqttKVSCam %s %s kvsBackToApp -> %s",
                 self.device.device_mac,
                 self.device.device_detail.device_type,
-                payload_str,
+                DebugBody(payload),
             )
-            payload = json.loads(payload_str)
-            if payload["type"] == "status":
-                kvs_status = KvsStatus()
-                kvs_status.__dict__.update(payload)
+        if not isinstance(payload, dict):
+            return
+        if payload["type"] == "status":
+            if (kvs_status := self.__parse(KvsStatus, payload)) is not None:
                 self.update_kvs_status(self.device.device_mac, kvs_status)
-            elif payload["type"] == "sdCardCapacity":
-                sd_card_capacity = SdCardCapacity()
-                sd_card_capacity.__dict__.update(payload)
+        elif payload["type"] == "sdCardCapacity":
+            if (sd_card_capacity := self.__parse(SdCardCapacity, payload)) is not None:
                 self.update_sd_card_capacity(self.device.device_mac, sd_card_capacity)
-            elif payload["type"] == "requestWiFiInfo":
-                wifi_info = WiFiInfo()
-                wifi_info.__dict__.update(payload)
+        elif payload["type"] == "requestWiFiInfo":
+            if (wifi_info := self.__parse(WiFiInfo, payload)) is not None:
                 self.update_wifi_info(self.device.device_mac, wifi_info)
-            elif (
-                payload["type"]
-                in [
-                    # button
-                    "autoUpgrade",
-                    "setCruiseOpen",
-                    "setPrivacy",
-                    "setDarkFullColor",
-                    "setFlipView",
-                    "setHumanFilter",
-                    "setIndicatorLight",
-                    "isOpenMobileTracking",
-                    "setMoveDetect",
-                    "setSdCardStorage",
-                    "setTimeWatermark",
-                    "setSensitive",
-                    "muteRecord",
-                    "createPreset",
-                    "rtspEnable",
-                    # select
-                    "setAntiFlicker",
-                    "set_night_vision",
-                    "set_intercom_way",
-                    "set_sensitive_level",
-                    "triggerPreset",
-                    # number
-                    "setVolumeLevel",
-                ]
-                and payload["ack"] == 0
-            ):
-                # reload the status
-                self.request_device_status()
-                if payload["type"] == "createPreset":
-                    self.complete_create_preset(
-                        self.device.device_mac, self.device.groupID
-                    )
+        elif (
+            command_type := ACK_COMMAND_TYPES.get(payload["type"], payload["type"])
+        ) in ACKED_COMMAND_TYPES:
+            acked = payload.get("ack") == 0
+            if self.command_tracker is not None:
+                self.command_tracker.resolve(
+                    self.device.device_mac, command_type, acked
+                )
+            if not acked:
+                return
+            # reload the status
+            self.request_device_status()
+            if payload["type"] == "createPreset":
+                self.complete_create_preset(self.device.device_mac, self.device.groupID)
+
+    def __parse(self, model: type[_ModelT], payload: dict[str, Any]) -> _ModelT | None:
+        """Parse a pushed message, None when it is invalid."""
+        try:
+            return from_dict(model, payload)
+        except (TypeError, ValueError) as err:
+            LOGGER.warning(
+                "Ignore invalid %s of %s: %s",
+                payload["type"],
+                self.device.device_mac,
+                err,
+            )
+            return None
+
+    def __send_command(self, command: dict[str, Any]) -> asyncio.Future[bool] | None:
+        """Publish a command.
+
+        Returns a future resolved with whether the camera acked it, None for
+        commands without ack or when no tracker is set. Must be called from the
+        event loop.
+        """
+        self._mqtt_client.publish(self.control_topic, json.dumps(command))
+        if self.command_tracker is None or command["type"] not in ACKED_COMMAND_TYPES:
+            return None
+        return self.command_tracker.track(self.device.device_mac, command["type"])
 
     def request_device_status(self) -> None:
         """request_device_status."""
@@ -308,330 +368,268 @@ class SwitchBotMqttKVSCam(MqttDevice):
             ),
         )
 
-    def motor(self, direction: MotorDirection, action: MotorAction) -> None:
+    def motor(
+        self, direction: MotorDirection, action: MotorAction
+    ) -> asyncio.Future[bool] | None:
         """Motor."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "motor",
-                    "direction": direction,
-                    "action": action,
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "motor",
+                "direction": direction,
+                "action": action,
+                "identifier": self.identifier,
+            }
         )
 
-    def set_flipview(self, open: bool) -> None:
+    def set_flipview(self, open: bool) -> asyncio.Future[bool] | None:
         """set_flipview."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "setFlipView",
-                    "open": open,
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "setFlipView",
+                "open": open,
+                "identifier": self.identifier,
+            }
         )
 
-    def set_camera_calibration(self) -> None:
+    def set_camera_calibration(self) -> asyncio.Future[bool] | None:
         """set_camera_calibration."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "setCameraCalibration",
-                    "open": True,
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "setCameraCalibration",
+                "open": True,
+                "identifier": self.identifier,
+            }
         )
 
-    def set_privacy(self, open: bool) -> None:
+    def set_privacy(self, open: bool) -> asyncio.Future[bool] | None:
         """set_privacy."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "setPrivacy",
-                    "open": open,
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "setPrivacy",
+                "open": open,
+                "identifier": self.identifier,
+            }
         )
 
-    def set_time_watermark(self, open: bool) -> None:
+    def set_time_watermark(self, open: bool) -> asyncio.Future[bool] | None:
         """set_time_watermark."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "setTimeWatermark",
-                    "open": open,
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "setTimeWatermark",
+                "open": open,
+                "identifier": self.identifier,
+            }
         )
 
-    def set_anti_flicker(self, level: AntiFlickerLevel) -> None:
+    def set_anti_flicker(self, level: AntiFlickerLevel) -> asyncio.Future[bool] | None:
         """set_anti_flicker."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "setAntiFlicker",
-                    "level": level,
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "setAntiFlicker",
+                "level": level,
+                "identifier": self.identifier,
+            }
         )
 
-    def set_night_vision(self, level: NightVisionLevel) -> None:
+    def set_night_vision(self, level: NightVisionLevel) -> asyncio.Future[bool] | None:
         """set_night_vision."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "setNightVision",
-                    "level": level,
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "setNightVision",
+                "level": level,
+                "identifier": self.identifier,
+            }
         )
 
-    def set_dark_full_color(self, open: bool) -> None:
+    def set_dark_full_color(self, open: bool) -> asyncio.Future[bool] | None:
         """set_dark_full_color."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "setDarkFullColor",
-                    "open": open,
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "setDarkFullColor",
+                "open": open,
+                "identifier": self.identifier,
+            }
         )
 
-    def trigger_preset(self, target: str) -> None:
+    def trigger_preset(self, target: str) -> asyncio.Future[bool] | None:
         """trigger_preset."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "triggerPreset",
-                    "target": target,
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "triggerPreset",
+                "target": target,
+                "identifier": self.identifier,
+            }
         )
 
-    def create_preset(self, name: str) -> None:
+    def create_preset(self, name: str) -> asyncio.Future[bool] | None:
         """create_preset."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "createPreset",
-                    "name": name,
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "createPreset",
+                "name": name,
+                "identifier": self.identifier,
+            }
         )
 
-    def update_rtsp_account(self, userName: str, password: str) -> None:
+    def update_rtsp_account(
+        self, userName: str, password: str
+    ) -> asyncio.Future[bool] | None:
         """update_rtsp_account."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "rtspUsernamePasswd",
-                    "userName": userName,
-                    "password": password,
-                    "timestamp": int(time.time()),
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "rtspUsernamePasswd",
+                "userName": userName,
+                "password": password,
+                "timestamp": int(time.time()),
+                "identifier": self.identifier,
+            }
         )
 
-    def set_auto_upgrade(self, open: bool) -> None:
+    def set_auto_upgrade(self, open: bool) -> asyncio.Future[bool] | None:
         """set_auto_upgrade."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "autoUpgrade",
-                    "open": open,
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "autoUpgrade",
+                "open": open,
+                "identifier": self.identifier,
+            }
         )
 
-    def set_cruise_open(self, open: bool) -> None:
+    def set_cruise_open(self, open: bool) -> asyncio.Future[bool] | None:
         """set_cruise_open."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "setCruiseOpen",
-                    "open": open,
-                    "timestamp": int(time.time()),
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "setCruiseOpen",
+                "open": open,
+                "timestamp": int(time.time()),
+                "identifier": self.identifier,
+            }
         )
 
-    def set_human_filter(self, open: bool) -> None:
+    def set_human_filter(self, open: bool) -> asyncio.Future[bool] | None:
         """set_human_filter."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "setHumanFilter",
-                    "open": open,
-                    "timestamp": int(time.time()),
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "setHumanFilter",
+                "open": open,
+                "timestamp": int(time.time()),
+                "identifier": self.identifier,
+            }
         )
 
-    def set_indicator_light(self, open: bool) -> None:
+    def set_indicator_light(self, open: bool) -> asyncio.Future[bool] | None:
         """set_indicator_light."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "setIndicatorLight",
-                    "open": open,
-                    "timestamp": int(time.time()),
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "setIndicatorLight",
+                "open": open,
+                "timestamp": int(time.time()),
+                "identifier": self.identifier,
+            }
         )
 
-    def set_mute_record(self, open: bool) -> None:
+    def set_mute_record(self, open: bool) -> asyncio.Future[bool] | None:
         """set_mute_record."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "muteRecord",
-                    "open": open,
-                    "timestamp": int(time.time()),
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "muteRecord",
+                "open": open,
+                "timestamp": int(time.time()),
+                "identifier": self.identifier,
+            }
         )
 
-    def set_rstp(self, open: bool) -> None:
+    def set_rstp(self, open: bool) -> asyncio.Future[bool] | None:
         """set_rstp."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "rtspEnable",
-                    "open": open,
-                    "timestamp": int(time.time()),
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "rtspEnable",
+                "open": open,
+                "timestamp": int(time.time()),
+                "identifier": self.identifier,
+            }
         )
 
-    def set_sd_card_storage(self, mode: RecordMode, open: bool) -> None:
+    def set_sd_card_storage(
+        self, mode: RecordMode, open: bool
+    ) -> asyncio.Future[bool] | None:
         """set_sd_card_storage."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "setSdCardStorage",
-                    "mode": str(mode),
-                    "record": "1" if open else "0",
-                    "timestamp": int(time.time()),
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "setSdCardStorage",
+                "mode": str(mode),
+                "record": "1" if open else "0",
+                "timestamp": int(time.time()),
+                "identifier": self.identifier,
+            }
         )
 
-    def set_intercom_way(self, intercom_way: IntercomWay) -> None:
+    def set_intercom_way(
+        self, intercom_way: IntercomWay
+    ) -> asyncio.Future[bool] | None:
         """set_intercom_way."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "setIntercomWay",
-                    "level": intercom_way,
-                    "timestamp": int(time.time()),
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "setIntercomWay",
+                "level": intercom_way,
+                "timestamp": int(time.time()),
+                "identifier": self.identifier,
+            }
         )
 
-    def set_sensitive_level(self, level: SensitivityLevel) -> None:
+    def set_sensitive_level(
+        self, level: SensitivityLevel
+    ) -> asyncio.Future[bool] | None:
         """set_sensitive_level."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "setSensitive",
-                    "level": level,
-                    "timestamp": int(time.time()),
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "setSensitive",
+                "level": level,
+                "timestamp": int(time.time()),
+                "identifier": self.identifier,
+            }
         )
 
-    def set_sound_alarm(self, open: bool) -> None:
+    def set_sound_alarm(self, open: bool) -> asyncio.Future[bool] | None:
         """set_sound_alarm."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "soundAlarm",
-                    "open": open,
-                    "timestamp": int(time.time()),
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "soundAlarm",
+                "open": open,
+                "timestamp": int(time.time()),
+                "identifier": self.identifier,
+            }
         )
 
-    def set_volume_level(self, level: VolumeLevel) -> None:
+    def set_volume_level(self, level: VolumeLevel) -> asyncio.Future[bool] | None:
         """set_volume_level."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "setVolumeLevel",
-                    "level": level,
-                    "timestamp": int(time.time()),
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "setVolumeLevel",
+                "level": level,
+                "timestamp": int(time.time()),
+                "identifier": self.identifier,
+            }
         )
 
-    def set_mobile_tracking(self, open: bool) -> None:
+    def set_mobile_tracking(self, open: bool) -> asyncio.Future[bool] | None:
         """set_mobile_tracking."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "isOpenMobileTracking",
-                    "open": open,
-                    "timestamp": int(time.time()),
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "isOpenMobileTracking",
+                "open": open,
+                "timestamp": int(time.time()),
+                "identifier": self.identifier,
+            }
         )
 
-    def set_move_detection(self, open: bool) -> None:
+    def set_move_detection(self, open: bool) -> asyncio.Future[bool] | None:
         """set_move_detection."""
-        self._mqtt_client.publish(
-            self.control_topic,
-            json.dumps(
-                {
-                    "type": "setMoveDetect",
-                    "open": open,
-                    "timestamp": int(time.time()),
-                    "identifier": self.identifier,
-                }
-            ),
+        return self.__send_command(
+            {
+                "type": "setMoveDetect",
+                "open": open,
+                "timestamp": int(time.time()),
+                "identifier": self.identifier,
+            }
         )
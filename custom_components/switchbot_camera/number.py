@@ -1,6 +1,6 @@
 """Support for SwitchBot KVS Camera Numberes."""
 
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 import logging
 
@@ -16,7 +16,8 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from . import SwitchBotKVSCameraConfigEntry
 from .api_client.api_client import Device
 from .base_entity import SwitchBotKVSEntity
-from .coordinator import SwitchBotKVSCameraCoordinator
+from .const import KVS_CAMERA_DEVICE_TYPES
+from .coordinator import FIELD_GROUP_STATUS, SwitchBotKVSCameraCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,8 +34,11 @@ class NumberDefinition:
         ],
         float | None,
     ]
-    set_native_value_func: Callable[[str, SwitchBotKVSCameraCoordinator, float], None]
+    set_native_value_func: Callable[
+        [str, SwitchBotKVSCameraCoordinator, float], Awaitable[bool] | None
+    ]
     icon: str | None = None
+    field_group: str | None = FIELD_GROUP_STATUS
     number_mode: NumberMode
     max_value: float
     min_value: float
@@ -52,6 +56,7 @@ NUMBERS: list[NumberDefinition] = [
             int(coordinator.data.kvs_statuses[device_mac].volumeLevel)
         )
         if device_mac in coordinator.data.kvs_statuses
+        and coordinator.data.kvs_statuses[device_mac].volumeLevel is not None
         else None,
         set_native_value_func=lambda device_mac,
         coordinator,
@@ -68,11 +73,7 @@ async def async_setup_entry(
     """Set up the Numbers."""
     coordinator: SwitchBotKVSCameraCoordinator = config_entry.runtime_data.coordinator
     entities: list[SwitchBotKVSNumberEntity] = []
-    for kvsCam in (
-        device
-        for device in coordinator.data.devices.devices
-        if device.device_detail.device_type in ("WoCamKvs5mp", "WoCamKvs")
-    ):
+    for kvsCam in coordinator.get_devices_by_type(KVS_CAMERA_DEVICE_TYPES):
         entities.extend(
             [
                 SwitchBotKVSNumberEntity(
@@ -99,6 +100,8 @@ class SwitchBotKVSNumberEntity(SwitchBotKVSEntity, NumberEntity):
         """Init number."""
         SwitchBotKVSEntity.__init__(self, coordinator, device)
         NumberEntity.__init__(self)
+        if number_definition.field_group is not None:
+            self._field_groups = (number_definition.field_group,)
         self.entity_description = NumberEntityDescription(
             key=number_definition.key,
             translation_key=number_definition.key,
@@ -122,10 +125,13 @@ class SwitchBotKVSNumberEntity(SwitchBotKVSEntity, NumberEntity):
     @property
     def native_value(self) -> float | None:
         """Return the entity value to represent the entity state."""
-        return self.native_value_func(self.device.device_mac, self.coordinator)
+        return self._optimistic_or(
+            self.native_value_func(self.device.device_mac, self.coordinator)
+        )
 
-    def set_native_value(self, value: float) -> None:
+    async def async_set_native_value(self, value: float) -> None:
         """Set new value."""
-        return self.set_native_value_func(
-            self.device.device_mac, self.coordinator, value
+        await self._async_run_command(
+            self.set_native_value_func(self.device.device_mac, self.coordinator, value),
+            value,
         )
@@ -1,6 +1,6 @@
 """Support for SwitchBot KVS Camera Selectes."""
 
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 import logging
 
@@ -12,7 +12,12 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from . import SwitchBotKVSCameraConfigEntry
 from .api_client.api_client import Device
 from .base_entity import SwitchBotKVSEntity
-from .coordinator import SwitchBotKVSCameraCoordinator
+from .const import KVS_CAMERA_DEVICE_TYPES
+from .coordinator import (
+    FIELD_GROUP_PRESETS,
+    FIELD_GROUP_STATUS,
+    SwitchBotKVSCameraCoordinator,
+)
 from .mqtt_client.mqtt_kvs_cam import (
     AntiFlickerLevel,
     IntercomWay,
@@ -37,8 +42,15 @@ class SelectDefinition:
         ],
         str | None,
     ]
-    select_option_func: Callable[[str, SwitchBotKVSCameraCoordinator, str], None]
+    select_option_func: Callable[
+        [str, SwitchBotKVSCameraCoordinator, str], Awaitable[bool] | None
+    ]
+    # Returns the version of dynamic options, static options are read once
+    options_version_func: Callable[[str, SwitchBotKVSCameraCoordinator], int] | None = (
+        None
+    )
     icon: str | None = None
+    field_group: str | None = FIELD_GROUP_STATUS
 
 
 SWITCHES: list[SelectDefinition] = [
@@ -52,6 +64,7 @@ SWITCHES: list[SelectDefinition] = [
             else "50hz"
         )
         if device_mac in coordinator.data.kvs_statuses
+        and coordinator.data.kvs_statuses[device_mac].antiFlicker is not None
         else None,
         select_option_func=lambda device_mac,
         coordinator,
@@ -72,6 +85,7 @@ SWITCHES: list[SelectDefinition] = [
             else "allways_on"
         )
         if device_mac in coordinator.data.kvs_statuses
+        and coordinator.data.kvs_statuses[device_mac].isOpenNightVision is not None
         else None,
         select_option_func=lambda device_mac,
         coordinator,
@@ -93,6 +107,7 @@ SWITCHES: list[SelectDefinition] = [
             else "twoway"
         )
         if device_mac in coordinator.data.kvs_statuses
+        and coordinator.data.kvs_statuses[device_mac].isOpenSingleIntercom is not None
         else None,
         select_option_func=lambda device_mac,
         coordinator,
@@ -113,6 +128,7 @@ SWITCHES: list[SelectDefinition] = [
             else "high"
         )
         if device_mac in coordinator.data.kvs_statuses
+        and coordinator.data.kvs_statuses[device_mac].sensitivityLevel is not None
         else None,
         select_option_func=lambda device_mac,
         coordinator,
@@ -133,6 +149,7 @@ SWITCHES: list[SelectDefinition] = [
             else "continues"
         )
         if device_mac in coordinator.data.kvs_statuses
+        and coordinator.data.kvs_statuses[device_mac].recordMode is not None
         else None,
         select_option_func=lambda device_mac, coordinator, value: (
             coordinator.mqtt_kvs_cams[device_mac].set_sd_card_storage(
@@ -141,24 +158,22 @@ SWITCHES: list[SelectDefinition] = [
             )
         )
         if device_mac in coordinator.data.kvs_statuses
+        and coordinator.data.kvs_statuses[device_mac].isOpenRecord is not None
         else None,
     ),
     SelectDefinition(
         key="preset_list",
-        enum_options_func=lambda device_mac, coordinator,: (
-            [""] + [preset.name for preset in coordinator.data.kvs_presets[device_mac]]
-        )
-        if device_mac in coordinator.data.kvs_presets
-        else None,
+        field_group=FIELD_GROUP_PRESETS,
+        enum_options_func=lambda device_mac,
+        coordinator,: coordinator.get_preset_options(device_mac),
+        options_version_func=lambda device_mac,
+        coordinator,: coordinator.get_preset_version(device_mac),
         current_option_func=lambda device_mac,
         coordinator,: coordinator.data.kvs_preset_selects.get(device_mac, None),
         select_option_func=lambda device_mac, coordinator, value: (
             coordinator.data.kvs_preset_selects.update({device_mac: value})
         )
-        if device_mac in coordinator.data.kvs_presets
-        and value != ""
-        and value
-        in (preset.name for preset in coordinator.data.kvs_presets[device_mac])
+        if coordinator.get_preset_by_name(device_mac, value) is not None
         else None,
     ),
 ]
@@ -172,11 +187,7 @@ async def async_setup_entry(
     """Set up the Selects."""
     coordinator: SwitchBotKVSCameraCoordinator = config_entry.runtime_data.coordinator
     entities: list[SwitchBotKVSSelectEntity] = []
-    for kvsCam in (
-        device
-        for device in coordinator.data.devices.devices
-        if device.device_detail.device_type in ("WoCamKvs5mp", "WoCamKvs")
-    ):
+    for kvsCam in coordinator.get_devices_by_type(KVS_CAMERA_DEVICE_TYPES):
         entities.extend(
             [
                 SwitchBotKVSSelectEntity(
@@ -203,6 +214,8 @@ class SwitchBotKVSSelectEntity(SwitchBotKVSEntity, SelectEntity):
         """Init select."""
         SwitchBotKVSEntity.__init__(self, coordinator, device)
         SelectEntity.__init__(self)
+        if select_definition.field_group is not None:
+            self._field_groups = (select_definition.field_group,)
         self.entity_description = SelectEntityDescription(
             key=select_definition.key,
             translation_key=select_definition.key,
@@ -216,26 +229,48 @@ class SwitchBotKVSSelectEntity(SwitchBotKVSEntity, SelectEntity):
         self.unique_id = (
             f"select.switchbot_camera_{device.device_mac}_{select_definition.key}"
         )
-        self._attr_options = select_definition.enum_options_func(
-            device.device_mac, coordinator
-        )
         self.enum_options_func = select_definition.enum_options_func
+        self.options_version_func = select_definition.options_version_func
+        self._options_version: int | None = None
+        self._update_options()
         self.current_option_func = select_definition.current_option_func
         self.select_option_func = select_definition.select_option_func
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Update camera with latest data from coordinator."""
+    def _update_options(self) -> None:
+        """Read the options, static ones once and dynamic ones on a new version."""
+        version = (
+            0
+            if self.options_version_func is None
+            else self.options_version_func(self.device.device_mac, self.coordinator)
+        )
+        if version == self._options_version:
+            return
+        self._options_version = version
         self._attr_options = self.enum_options_func(
             self.device.device_mac, self.coordinator
         )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update camera with latest data from coordinator."""
+        self._update_options()
         super()._handle_coordinator_update()
 
     @property
     def current_option(self) -> str | None:
         """Return the selected entity option to represent the entity state."""
-        return self.current_option_func(self.device.device_mac, self.coordinator)
+        return self._optimistic_or(
+            self.current_option_func(self.device.device_mac, self.coordinator)
+        )
 
-    def select_option(self, option: str) -> None:
+    async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
-        return self.select_option_func(self.device.device_mac, self.coordinator, option)
+        command = self.select_option_func(
+            self.device.device_mac, self.coordinator, option
+        )
+        if command is None:
+            # Only the coordinator data changed, nothing was sent to the camera
+            self.coordinator.async_notify_updated(
+                self.device.device_mac, *self._field_groups
+            )
+        await self._async_run_command(command, option)
@@ -20,7 +20,13 @@ from homeassistant.helpers.typing import StateType
 from . import SwitchBotKVSCameraConfigEntry
 from .api_client.api_client import Device
 from .base_entity import SwitchBotKVSEntity
-from .coordinator import SwitchBotKVSCameraCoordinator
+from .const import KVS_CAMERA_DEVICE_TYPES
+from .coordinator import (
+    FIELD_GROUP_SD_CARD_CAPACITY,
+    FIELD_GROUP_STATUS,
+    FIELD_GROUP_WIFI_INFO,
+    SwitchBotKVSCameraCoordinator,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,11 +42,13 @@ class SensorDefinition:
     device_class: SensorDeviceClass | None = None
     state_class: SensorStateClass | None = None
     icon: str | None = None
+    field_group: str | None = FIELD_GROUP_STATUS
 
 
 SENSORS: list[SensorDefinition] = [
     SensorDefinition(
         key="ip_address",
+        field_group=FIELD_GROUP_WIFI_INFO,
         native_value_func=lambda device_mac,
         coordinator: coordinator.data.kvs_wifi_infos[device_mac].ipAddress
         if device_mac in coordinator.data.kvs_wifi_infos
@@ -49,6 +57,7 @@ SENSORS: list[SensorDefinition] = [
     ),
     SensorDefinition(
         key="wifi_signal",
+        field_group=FIELD_GROUP_WIFI_INFO,
         native_value_func=lambda device_mac,
         coordinator: coordinator.data.kvs_wifi_infos[device_mac].wifiSignal
         if device_mac in coordinator.data.kvs_wifi_infos
@@ -57,6 +66,7 @@ SENSORS: list[SensorDefinition] = [
     ),
     SensorDefinition(
         key="wifi_name",
+        field_group=FIELD_GROUP_WIFI_INFO,
         native_value_func=lambda device_mac,
         coordinator: coordinator.data.kvs_wifi_infos[device_mac].wifiName
         if device_mac in coordinator.data.kvs_wifi_infos
@@ -65,6 +75,7 @@ SENSORS: list[SensorDefinition] = [
     ),
     SensorDefinition(
         key="sd_free",
+        field_group=FIELD_GROUP_SD_CARD_CAPACITY,
         native_value_func=lambda device_mac,
         coordinator: coordinator.data.kvs_sd_card_capacities[device_mac].free
         if device_mac in coordinator.data.kvs_sd_card_capacities
@@ -74,6 +85,7 @@ SENSORS: list[SensorDefinition] = [
     ),
     SensorDefinition(
         key="sd_total",
+        field_group=FIELD_GROUP_SD_CARD_CAPACITY,
         native_value_func=lambda device_mac,
         coordinator: coordinator.data.kvs_sd_card_capacities[device_mac].total
         if device_mac in coordinator.data.kvs_sd_card_capacities
@@ -83,6 +95,7 @@ SENSORS: list[SensorDefinition] = [
     ),
     SensorDefinition(
         key="sd_used",
+        field_group=FIELD_GROUP_SD_CARD_CAPACITY,
         native_value_func=lambda device_mac,
         coordinator: coordinator.data.kvs_sd_card_capacities[device_mac].used
         if device_mac in coordinator.data.kvs_sd_card_capacities
@@ -112,27 +125,31 @@ SENSORS: list[SensorDefinition] = [
             coordinator.data.kvs_statuses[device_mac].timestamp, tz=UTC
         )
         if device_mac in coordinator.data.kvs_statuses
+        and coordinator.data.kvs_statuses[device_mac].timestamp is not None
         else None,
         device_class=SensorDeviceClass.TIMESTAMP,
     ),
     SensorDefinition(
         key="device_mac",
+        field_group=None,
         native_value_func=lambda device_mac, data: device_mac,
     ),
     SensorDefinition(
         key="rstp_rtsp_main_url",
         native_value_func=lambda device_mac, coordinator: coordinator.data.kvs_statuses[
             device_mac
-        ].rtsp["rtspMainUrl"]
+        ].rtsp.rtspMainUrl
         if device_mac in coordinator.data.kvs_statuses
+        and coordinator.data.kvs_statuses[device_mac].rtsp is not None
         else None,
     ),
     SensorDefinition(
         key="rstp_rtsp_sub_url",
         native_value_func=lambda device_mac, coordinator: coordinator.data.kvs_statuses[
             device_mac
-        ].rtsp["rtspSubUrl"]
+        ].rtsp.rtspSubUrl
         if device_mac in coordinator.data.kvs_statuses
+        and coordinator.data.kvs_statuses[device_mac].rtsp is not None
         else None,
     ),
 ]
@@ -146,11 +163,7 @@ async def async_setup_entry(
     """Set up the Sensors."""
     coordinator: SwitchBotKVSCameraCoordinator = config_entry.runtime_data.coordinator
     entities: list[SwitchBotKVSSensorEntity] = []
-    for kvsCam in (
-        device
-        for device in coordinator.data.devices.devices
-        if device.device_detail.device_type in ("WoCamKvs5mp", "WoCamKvs")
-    ):
+    for kvsCam in coordinator.get_devices_by_type(KVS_CAMERA_DEVICE_TYPES):
         entities.extend(
             [
                 SwitchBotKVSSensorEntity(
@@ -177,6 +190,8 @@ class SwitchBotKVSSensorEntity(SwitchBotKVSEntity, SensorEntity):
         """Init sensor."""
         SwitchBotKVSEntity.__init__(self, coordinator, device)
         SensorEntity.__init__(self)
+        if sensor_definition.field_group is not None:
+            self._field_groups = (sensor_definition.field_group,)
         self.entity_description = SensorEntityDescription(
             key=sensor_definition.key,
             translation_key=sensor_definition.key,
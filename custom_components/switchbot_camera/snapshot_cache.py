@@ -0,0 +1,116 @@
+"""Snapshot cache shared by the cameras."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.singleton import singleton
+
+from .const import DOMAIN
+
+# Bytes of JPEG kept for all the cameras together
+SNAPSHOT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+# Camera entity id, width and height
+SnapshotKey = tuple[str, int | None, int | None]
+
+
+@dataclass(frozen=True, slots=True)
+class _SnapshotCacheEntry:
+    image: bytes
+    expires_at: float
+
+
+class SnapshotCache:
+    """Least recently used snapshots, bounded by their total size.
+
+    Entries expire after the snapshot interval of their camera.
+    """
+
+    def __init__(self, max_bytes: int = SNAPSHOT_CACHE_MAX_BYTES) -> None:
+        """Initialize."""
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[SnapshotKey, _SnapshotCacheEntry] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: SnapshotKey) -> bytes | None:
+        """Return a snapshot, None when it is missing or expired."""
+        if (image := self.peek(key)) is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return image
+
+    def peek(self, key: SnapshotKey) -> bytes | None:
+        """Return a snapshot without counting nor refreshing it."""
+        if (entry := self._entries.get(key)) is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            return None
+        return entry.image
+
+    def ttl_of(self, key: SnapshotKey) -> timedelta | None:
+        """Return how long a snapshot is still valid, None when it is missing."""
+        if (entry := self._entries.get(key)) is None:
+            return None
+        if (remaining := entry.expires_at - time.monotonic()) <= 0:
+            return None
+        return timedelta(seconds=remaining)
+
+    def put(self, key: SnapshotKey, image: bytes, ttl: timedelta) -> None:
+        """Cache a snapshot, evicting the least recently used over the budget."""
+        self._remove(key)
+        if len(image) > self.max_bytes:
+            return
+        now = time.monotonic()
+        for expired_key in [
+            expired_key
+            for expired_key, entry in self._entries.items()
+            if entry.expires_at <= now
+        ]:
+            self._remove(expired_key)
+            self.expirations += 1
+        while self._entries and self._bytes + len(image) > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        self._entries[key] = _SnapshotCacheEntry(image, now + ttl.total_seconds())
+        self._bytes += len(image)
+
+    def remove_camera(self, camera: str) -> None:
+        """Drop all the snapshots of a camera."""
+        for key in [key for key in self._entries if key[0] == camera]:
+            self._remove(key)
+
+    def _remove(self, key: SnapshotKey) -> None:
+        if (entry := self._entries.pop(key, None)) is not None:
+            self._bytes -= len(entry.image)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the size and counters of the cache."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+@singleton(f"{DOMAIN}_snapshot_cache")
+def get_snapshot_cache(hass: HomeAssistant) -> SnapshotCache:
+    """Return the snapshot cache shared by all the cameras."""
+    return SnapshotCache()
@@ -1,6 +1,6 @@
 """Support for SwitchBot KVS Camera Switches."""
 
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 import logging
 from typing import Any
@@ -17,7 +17,8 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from . import SwitchBotKVSCameraConfigEntry
 from .api_client.api_client import Device
 from .base_entity import SwitchBotKVSEntity
-from .coordinator import SwitchBotKVSCameraCoordinator
+from .const import KVS_CAMERA_DEVICE_TYPES
+from .coordinator import FIELD_GROUP_STATUS, SwitchBotKVSCameraCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,11 +31,14 @@ class SwitchDefinition:
     is_on_func: Callable[[str, SwitchBotKVSCameraCoordinator], bool]
     turn_on_func: Callable[
         [str, SwitchBotKVSCameraCoordinator],
-        None,
+        Awaitable[bool] | None,
+    ]
+    turn_off_func: Callable[
+        [str, SwitchBotKVSCameraCoordinator], Awaitable[bool] | None
     ]
-    turn_off_func: Callable[[str, SwitchBotKVSCameraCoordinator], None]
     device_class: SwitchDeviceClass | None = None
     icon: str | None = None
+    field_group: str | None = FIELD_GROUP_STATUS
 
 
 SWITCHES: list[SwitchDefinition] = [
@@ -177,6 +181,7 @@ SWITCHES: list[SwitchDefinition] = [
             coordinator.data.kvs_statuses[device_mac].recordMode, True
         )
         if device_mac in coordinator.data.kvs_statuses
+        and coordinator.data.kvs_statuses[device_mac].recordMode is not None
         else None,
         turn_off_func=lambda device_mac, coordinator: coordinator.mqtt_kvs_cams[
             device_mac
@@ -184,6 +189,7 @@ SWITCHES: list[SwitchDefinition] = [
             coordinator.data.kvs_statuses[device_mac].recordMode, False
         )
         if device_mac in coordinator.data.kvs_statuses
+        and coordinator.data.kvs_statuses[device_mac].recordMode is not None
         else None,
     ),
     SwitchDefinition(
@@ -218,8 +224,9 @@ SWITCHES: list[SwitchDefinition] = [
         key="rstp_open",
         is_on_func=lambda device_mac, coordinator: coordinator.data.kvs_statuses[
             device_mac
-        ].rtsp["open"]
+        ].rtsp.open
         if device_mac in coordinator.data.kvs_statuses
+        and coordinator.data.kvs_statuses[device_mac].rtsp is not None
         else None,
         turn_on_func=lambda device_mac, coordinator: coordinator.mqtt_kvs_cams[
             device_mac
@@ -239,11 +246,7 @@ async def async_setup_entry(
     """Set up the Switches."""
     coordinator: SwitchBotKVSCameraCoordinator = config_entry.runtime_data.coordinator
     entities: list[SwitchBotKVSSwitchEntity] = []
-    for kvsCam in (
-        device
-        for device in coordinator.data.devices.devices
-        if device.device_detail.device_type in ("WoCamKvs5mp", "WoCamKvs")
-    ):
+    for kvsCam in coordinator.get_devices_by_type(KVS_CAMERA_DEVICE_TYPES):
         entities.extend(
             [
                 SwitchBotKVSSwitchEntity(
@@ -270,6 +273,8 @@ class SwitchBotKVSSwitchEntity(SwitchBotKVSEntity, SwitchEntity):
         """Init switch."""
         SwitchBotKVSEntity.__init__(self, coordinator, device)
         SwitchEntity.__init__(self)
+        if switch_definition.field_group is not None:
+            self._field_groups = (switch_definition.field_group,)
         self.entity_description = SwitchEntityDescription(
             key=switch_definition.key,
             translation_key=switch_definition.key,
@@ -291,12 +296,18 @@ class SwitchBotKVSSwitchEntity(SwitchBotKVSEntity, SwitchEntity):
     @property
     def is_on(self) -> bool:
         """Return true if switch is on."""
-        return self.is_on_func(self.device.device_mac, self.coordinator)
+        return self._optimistic_or(
+            self.is_on_func(self.device.device_mac, self.coordinator)
+        )
 
-    def turn_on(self, **kwargs: Any) -> None:
+    async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
-        return self.turn_on_func(self.device.device_mac, self.coordinator)
+        await self._async_run_command(
+            self.turn_on_func(self.device.device_mac, self.coordinator), True
+        )
 
-    def turn_off(self, **kwargs: Any) -> None:
+    async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
-        return self.turn_off_func(self.device.device_mac, self.coordinator)
+        await self._async_run_command(
+            self.turn_off_func(self.device.device_mac, self.coordinator), False
+        )
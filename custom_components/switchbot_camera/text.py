@@ -12,7 +12,12 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from . import SwitchBotKVSCameraConfigEntry
 from .api_client.api_client import Device
 from .base_entity import SwitchBotKVSEntity
-from .coordinator import SwitchBotKVSCameraCoordinator
+from .const import KVS_CAMERA_DEVICE_TYPES
+from .coordinator import (
+    FIELD_GROUP_PRESETS,
+    FIELD_GROUP_RTSP,
+    SwitchBotKVSCameraCoordinator,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,11 +30,13 @@ class TextDefinition:
     native_value_func: Callable[[str, SwitchBotKVSCameraCoordinator], str | None]
     set_value_func: Callable[[str, SwitchBotKVSCameraCoordinator, str], None]
     icon: str
+    field_group: str | None
 
 
 TEXTS: list[TextDefinition] = [
     TextDefinition(
         key="create_preset_name",
+        field_group=FIELD_GROUP_PRESETS,
         native_value_func=lambda device_mac,
         coordinator: coordinator.data.kvs_preset_texts.get(device_mac, None),
         set_value_func=lambda device_mac, coordinator, value,: (
@@ -41,6 +48,7 @@ TEXTS: list[TextDefinition] = [
     ),
     TextDefinition(
         key="rstp_password",
+        field_group=FIELD_GROUP_RTSP,
         native_value_func=lambda device_mac,
         coordinator: coordinator.data.kvs_rtsp_password.get(device_mac, None),
         set_value_func=lambda device_mac, coordinator, value,: (
@@ -52,6 +60,7 @@ TEXTS: list[TextDefinition] = [
     ),
     TextDefinition(
         key="rstp_user_name",
+        field_group=FIELD_GROUP_RTSP,
         native_value_func=lambda device_mac,
         coordinator: coordinator.data.kvs_rtsp_username.get(device_mac, None),
         set_value_func=lambda device_mac, coordinator, value,: (
@@ -72,11 +81,7 @@ async def async_setup_entry(
     """Set up the Texts."""
     coordinator: SwitchBotKVSCameraCoordinator = config_entry.runtime_data.coordinator
     entities: list[SwitchBotKVSTextEntity] = []
-    for kvsCam in (
-        device
-        for device in coordinator.data.devices.devices
-        if device.device_detail.device_type in ("WoCamKvs5mp", "WoCamKvs")
-    ):
+    for kvsCam in coordinator.get_devices_by_type(KVS_CAMERA_DEVICE_TYPES):
         entities.extend(
             [
                 SwitchBotKVSTextEntity(
@@ -103,6 +108,8 @@ class SwitchBotKVSTextEntity(SwitchBotKVSEntity, TextEntity):
         """Init text."""
         SwitchBotKVSEntity.__init__(self, coordinator, device)
         TextEntity.__init__(self)
+        if text_definition.field_group is not None:
+            self._field_groups = (text_definition.field_group,)
         self.entity_description = TextEntityDescription(
             key=text_definition.key,
             translation_key=text_definition.key,
@@ -124,6 +131,9 @@ class SwitchBotKVSTextEntity(SwitchBotKVSEntity, TextEntity):
         """Return the value reported by the text."""
         return self.native_value_func(self.device.device_mac, self.coordinator)
 
-    def set_value(self, value: str) -> None:
+    async def async_set_value(self, value: str) -> None:
         """Set the text value."""
         self.set_value_func(self.device.device_mac, self.coordinator, value)
+        self.coordinator.async_notify_updated(
+            self.device.device_mac, *self._field_groups
+        )
@@ -0,0 +1,89 @@
+"""Benchmark the MQTT payload classification of SwitchBotMqttClient.
+
+Compares process_common_payload with the implementation it replaced, for a
+text, a binary and a JSON payload. Run from the repository root in an
+environment with the integration requirements (Home Assistant, paho-mqtt):
+
+    python scripts/bench_payload_classify.py [--iterations N]
+"""
+
+import argparse
+import json
+from pathlib import Path
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.switchbot_camera.mqtt_client.mqtt_client import (  # noqa: E402
+    SwitchBotMqttClient,
+)
+
+ALLOW_CHARS = bytes(
+    "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz -_|;:",
+    "utf-8",
+)
+
+PAYLOADS = {
+    "text": b"WoCamKvs AABBCCDDEEFF status online|ip:192-168-0-2|rssi:-50;"
+    b" fw:V1-0-0-45 hw:2 tz:Asia-Tokyo|record:event;motion:on;human:off;"
+    b"privacy:off;cruise:off;flip:off;light:on;watermark:on;volume:50;end",
+    "binary": b"WoCamKvs AABBCCDDEEFF " + bytes(range(256))[:167],
+    "json": json.dumps(
+        {
+            "type": "status",
+            "ack": 0,
+            "identifier": "android_aabbccddeeff_0123abcd_4567",
+            "timestamp": 1700000000,
+            "isInPrivateMode": False,
+            "volumeLevel": "50",
+        }
+    ).encode(),
+}
+
+
+def legacy_process_common_payload(payload: bytes) -> str:
+    """Process payload, as implemented before the bytes.translate change."""
+    if len(payload) == 0:
+        return ""
+
+    if len(payload) > 1 and payload[0] == ord("{") and payload[-1] == ord("}"):
+        # json
+        json_object = json.loads(bytes(payload).decode("utf-8"))
+        return json.dumps(json_object, ensure_ascii=False)
+
+    if all(b in ALLOW_CHARS for b in payload):
+        return bytes(payload).decode("utf-8")
+
+    try:
+        index = payload.index(ord(" "), payload.index(ord(" ")) + 1)
+        return f"{bytes(payload[:index]).decode('utf-8')} HEX({bytes(payload[index:]).hex().upper()})"
+    except ValueError:
+        return f"HEX({bytes(payload).hex().upper()})"
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    client = SwitchBotMqttClient("bench", "mqtts://localhost:8883", "", "")
+    for name, payload in PAYLOADS.items():
+        legacy = legacy_process_common_payload(payload)
+        current = client.process_common_payload(payload)
+        # JSON is now returned decoded instead of re-serialized
+        assert (json.loads(legacy) if name == "json" else legacy) == current, name
+        timings = [
+            timeit.timeit(lambda f=f, p=payload: f(p), number=args.iterations)
+            / args.iterations
+            * 1e6
+            for f in (legacy_process_common_payload, client.process_common_payload)
+        ]
+        print(  # noqa: T201
+            f"{name:7} {len(payload):4} B  {timings[0]:8.2f} us -> {timings[1]:6.2f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Tests for the SwitchBot KVSCamera coordinator."""
+
+from dataclasses import replace
+from unittest.mock import MagicMock
+
+from custom_components.switchbot_camera.coordinator import (
+    FIELD_GROUP_STATUS,
+    CoordinatorData,
+    SwitchBotKVSCameraCoordinator,
+)
+from custom_components.switchbot_camera.mqtt_client.mqtt_kvs_cam import (
+    KvsStatus,
+    Rtsp,
+    SdCardCapacity,
+    WiFiInfo,
+)
+
+DEVICE_MAC = "AABBCCDDEEFF"
+
+KVS_STATUS = KvsStatus(
+    antiFlicker="60hz",
+    autoUpgrade=True,
+    isCruiseOpen=False,
+    isInPrivateMode=False,
+    isOpenDarkFullColor=False,
+    isOpenFlipScreen=False,
+    isOpenHumamFilter=False,
+    isOpenIndicatorLight=True,
+    isOpenMobileTracking=False,
+    isOpenMotionDetection=True,
+    isOpenNightVision="auto",
+    isOpenRecord=True,
+    isOpenSingleIntercom="twoway",
+    isOpenTimeWatermark=True,
+    muteRecord=False,
+    recordMode=1,
+    rtsp=Rtsp(open=True, password="password", userName="user"),
+    sensitivityLevel="medium",
+    timestamp=1700000000,
+    type="status",
+    volumeLevel="50",
+)
+SD_CARD_CAPACITY = SdCardCapacity(
+    free=10.0, timestamp=1700000000, total=32.0, type="sdCardCapacity", used=22.0
+)
+WIFI_INFO = WiFiInfo(
+    ipAddress="192.168.0.2",
+    timestamp=1700000000,
+    type="requestWiFiInfo",
+    wifiName="wifi",
+    wifiSignal="-50",
+)
+
+
+def _coordinator() -> SwitchBotKVSCameraCoordinator:
+    coordinator = SwitchBotKVSCameraCoordinator.__new__(SwitchBotKVSCameraCoordinator)
+    coordinator.data = CoordinatorData(
+        kvs_statuses={},
+        kvs_sd_card_capacities={},
+        kvs_wifi_infos={},
+        kvs_rtsp_username={},
+        kvs_rtsp_password={},
+    )
+    coordinator._field_group_refreshed_at = {}
+    coordinator.async_notify_updated = MagicMock()
+    return coordinator
+
+
+def test_push_differing_only_by_timestamp_notifies_nothing() -> None:
+    """Pushes that only carry a new timestamp do not update entities."""
+    coordinator = _coordinator()
+    coordinator.on_kvs_status_update(DEVICE_MAC, KVS_STATUS)
+    coordinator.update_sd_card_capacity(DEVICE_MAC, SD_CARD_CAPACITY)
+    coordinator.update_wifi_info(DEVICE_MAC, WIFI_INFO)
+    coordinator.async_notify_updated.reset_mock()
+
+    coordinator.on_kvs_status_update(
+        DEVICE_MAC, replace(KVS_STATUS, timestamp=1700000060)
+    )
+    coordinator.update_sd_card_capacity(
+        DEVICE_MAC, replace(SD_CARD_CAPACITY, timestamp=1700000060)
+    )
+    coordinator.update_wifi_info(DEVICE_MAC, replace(WIFI_INFO, timestamp=1700000060))
+
+    # The status handler always calls it, with no changed field group here
+    assert all(
+        call.args == (DEVICE_MAC,)
+        for call in coordinator.async_notify_updated.call_args_list
+    )
+    assert coordinator.data.kvs_statuses[DEVICE_MAC].timestamp == 1700000060
+
+
+def test_push_with_changed_value_notifies_its_field_group() -> None:
+    """A changed value notifies the field group it belongs to."""
+    coordinator = _coordinator()
+    coordinator.on_kvs_status_update(DEVICE_MAC, KVS_STATUS)
+    coordinator.async_notify_updated.reset_mock()
+
+    coordinator.on_kvs_status_update(
+        DEVICE_MAC, replace(KVS_STATUS, isInPrivateMode=True, timestamp=1700000060)
+    )
+
+    coordinator.async_notify_updated.assert_called_once_with(
+        DEVICE_MAC, FIELD_GROUP_STATUS
+    )
+
+
+def test_push_without_rtsp_keeps_the_credentials() -> None:
+    """A status missing its optional fields keeps the known RTSP credentials."""
+    coordinator = _coordinator()
+    coordinator.on_kvs_status_update(DEVICE_MAC, KVS_STATUS)
+    coordinator.async_notify_updated.reset_mock()
+
+    coordinator.on_kvs_status_update(DEVICE_MAC, KvsStatus(type="status"))
+
+    coordinator.async_notify_updated.assert_called_once_with(
+        DEVICE_MAC, FIELD_GROUP_STATUS
+    )
+    assert coordinator.data.kvs_rtsp_username[DEVICE_MAC] == "user"